@@ -0,0 +1,108 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Sequence, Union
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton finding many terms in one pass, ignoring case.
+
+    Terms are folded to lower case and every lower-case transition also gets
+    its upper-case twin, so the haystack is scanned as-is without building a
+    lowered copy. Failure links are folded into a dense transition table at
+    build time; scanning is a single dict lookup per byte or character.
+    Case folding covers characters with a single-character upper case form,
+    which is every ASCII letter for binary automatons.
+    """
+
+    def __init__(self, terms: Iterable[str], binary: bool = True) -> None:
+        self.terms: List[str] = []
+        seen = set()
+        for term in terms:
+            folded = term.lower()
+            if folded and folded not in seen:
+                seen.add(folded)
+                self.terms.append(term)
+        self.binary = binary
+
+        self._delta: List[Dict[Hashable, int]] = [{}]
+        self._outputs: List[List[int]] = [[]]
+        for index, term in enumerate(self.terms):
+            self._insert(self._units(term.lower()), index)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find(self, haystack: Union[bytes, str]) -> List[str]:
+        """Return the terms present in `haystack`, in configuration order."""
+        delta = self._delta
+        outputs = self._outputs
+        remaining = len(self.terms)
+        found = [False] * remaining
+        state = 0
+        for unit in haystack:
+            state = delta[state].get(unit, 0)
+            for index in outputs[state]:
+                if not found[index]:
+                    found[index] = True
+                    remaining -= 1
+            if not remaining:
+                break
+        return [term for term, hit in zip(self.terms, found) if hit]
+
+    def search(self, haystack: Union[bytes, str]) -> bool:
+        """Return True as soon as any term is found."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for unit in haystack:
+            state = delta[state].get(unit, 0)
+            if outputs[state]:
+                return True
+        return False
+
+    def _units(self, term: str) -> Sequence[Hashable]:
+        return term.encode("utf-8") if self.binary else term
+
+    def _insert(self, units: Sequence[Hashable], index: int) -> None:
+        state = 0
+        for unit in units:
+            nxt = self._delta[state].get(unit)
+            if nxt is None:
+                nxt = len(self._delta)
+                self._delta.append({})
+                self._outputs.append([])
+                self._delta[state][unit] = nxt
+            state = nxt
+        self._outputs[state].append(index)
+
+    def _link(self) -> None:
+        # Breadth-first: each state inherits the transitions of its failure
+        # state, then overrides them with its own trie edges.
+        goto = [dict(edges) for edges in self._delta]
+        fail = [0] * len(goto)
+        queue = deque()
+        for nxt in goto[0].values():
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for unit, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and unit not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(unit, 0)
+                fail[nxt] = target if target != nxt else 0
+                self._outputs[nxt] = self._outputs[nxt] + self._outputs[fail[nxt]]
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+
+        for edges in self._delta:
+            for unit, nxt in list(edges.items()):
+                upper = self._upper(unit)
+                if upper is not None and upper not in edges:
+                    edges[upper] = nxt
+
+    def _upper(self, unit: Hashable) -> Hashable:
+        if self.binary:
+            return unit - 32 if 97 <= unit <= 122 else None
+        upper = unit.upper()
+        return upper if len(upper) == 1 and upper != unit else None
@@ -1,6 +1,7 @@
 import os
-from dataclasses import dataclass
-from typing import List, Optional
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -26,6 +27,26 @@ class ModuleConfig:
     rule: RuleConfig
     service_filter: List[str]
     enabled: bool
+    urls: List[str] = field(default_factory=list)
+    module_type: str = ""
+    parse_mode: str = ""
+    feed_url: str = ""
+
+
+@dataclass
+class SchedulerConfig:
+    startup_jitter_seconds: float
+    max_concurrency: int
+    max_concurrency_per_host: int
+    prewarm_seconds: float = 0.0
+
+
+@dataclass
+class HttpConfig:
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry_seconds: float
+    http2: bool
 
 
 @dataclass
@@ -34,6 +55,8 @@ class AppConfig:
     defaults: DefaultConfig
     log_level: str
     notifications: "NotificationConfig"
+    scheduler: SchedulerConfig
+    http: HttpConfig
 
 
 @dataclass
@@ -44,14 +67,53 @@ class TelegramConfig:
     api_url: str
     timestamp_format: str
     timestamp_zone: str
+    rate_global_per_second: float = 30.0
+    rate_chat_per_second: float = 1.0
+    rate_group_per_minute: float = 20.0
+    max_retries: int = 5
 
 
 @dataclass
-class WebhookConfig:
-    enabled: bool
+class WebhookTargetConfig:
+    name: str
     url: Optional[str]
     token: Optional[str]
     header_name: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    modules: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+
+
+@dataclass
+class WebhookConfig:
+    enabled: bool
+    targets: List[WebhookTargetConfig]
+    max_connections: int = 20
+    outbox_path: str = ""
+    max_attempts: int = 20
+    retry_base_seconds: float = 2.0
+    retry_max_seconds: float = 300.0
+    batch_seconds: float = 0.0
+    batch_max_events: int = 100
+    gzip_min_bytes: int = 0
+
+
+@dataclass
+class AlertStateConfig:
+    backend: str = "memory"
+    path: str = "data/alert-state.json"
+    compact_records: int = 1000
+    ttl_seconds: float = 86400.0
+    max_entries: int = 100000
+    report_seconds: float = 300.0
+
+
+@dataclass
+class NotificationQueueConfig:
+    max_size: int
+    workers: int
+    policy: str
+    merge: bool
 
 
 @dataclass
@@ -59,6 +121,11 @@ class NotificationConfig:
     telegram: TelegramConfig
     webhook: WebhookConfig
     repeat_minutes: int
+    queue: NotificationQueueConfig
+    fanout_concurrency: int = 10
+    state: AlertStateConfig = field(default_factory=AlertStateConfig)
+    digest_seconds: float = 0.0
+    digest_scope: str = "module"
 
 
 def load_app_config() -> AppConfig:
@@ -69,37 +136,84 @@ def load_app_config() -> AppConfig:
     )
 
     module_slugs = _get_module_slugs()
-    modules = [_load_module_config(slug, defaults) for slug in module_slugs]
+    modules = [
+        _load_module_config(slug, module_type, defaults)
+        for slug, module_type in module_slugs
+    ]
 
     log_level = os.getenv("SERVICE_MONITOR_LOG_LEVEL", "INFO").upper()
 
     notifications = _load_notification_config()
 
+    scheduler = SchedulerConfig(
+        startup_jitter_seconds=_get_float("SERVICE_MONITOR_STARTUP_JITTER_SECONDS", 10.0),
+        max_concurrency=_get_int("SERVICE_MONITOR_MAX_CONCURRENCY", 32),
+        max_concurrency_per_host=_get_int("SERVICE_MONITOR_MAX_CONCURRENCY_PER_HOST", 2),
+        prewarm_seconds=_get_float("SERVICE_MONITOR_PREWARM_SECONDS", 0.0),
+    )
+
+    # Keep idle connections alive across a full poll interval by default.
+    http = HttpConfig(
+        max_connections=_get_int("SERVICE_MONITOR_HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_get_int(
+            "SERVICE_MONITOR_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20
+        ),
+        keepalive_expiry_seconds=_get_float(
+            "SERVICE_MONITOR_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+            float(defaults.interval_seconds + 30),
+        ),
+        http2=_get_bool("SERVICE_MONITOR_HTTP2", False),
+    )
+
     return AppConfig(
         modules=modules,
         defaults=defaults,
         log_level=log_level,
         notifications=notifications,
+        scheduler=scheduler,
+        http=http,
     )
 
 
-def _get_module_slugs() -> List[str]:
+def _get_module_slugs() -> List[tuple[str, str]]:
+    # Entries are a module type (`aws`) or a named instance of one (`aws-eu:aws`).
     raw = os.getenv("SERVICE_MONITOR_MODULES")
     if raw is None or not raw.strip():
-        return ["steam"]
-    return [slug.strip().lower() for slug in raw.split(",") if slug.strip()]
-
-
-def _load_module_config(slug: str, defaults: DefaultConfig) -> ModuleConfig:
-    prefix = slug.upper()
-    url = os.getenv(f"{prefix}_URL", _default_url(slug))
-    interval_seconds = _get_int(f"{prefix}_INTERVAL_SECONDS", defaults.interval_seconds)
-    timeout_seconds = _get_float(f"{prefix}_TIMEOUT_SECONDS", defaults.timeout_seconds)
-    user_agent = os.getenv(f"{prefix}_USER_AGENT", defaults.user_agent)
-    rule_kind = os.getenv(f"{prefix}_RULE_KIND", "status").lower()
-    rule_value = os.getenv(f"{prefix}_RULE_VALUE", "major,minor")
-    service_filter = _get_service_filter(f"{prefix}_SERVICE_FILTER")
-    enabled = _get_bool(f"{prefix}_ENABLED", True)
+        return [("steam", "steam")]
+    slugs: List[tuple[str, str]] = []
+    for entry in raw.split(","):
+        entry = entry.strip().lower()
+        if not entry:
+            continue
+        name, _, module_type = entry.partition(":")
+        name = name.strip()
+        module_type = module_type.strip() or name
+        slugs.append((name, module_type))
+    return slugs
+
+
+def _load_module_config(
+    slug: str, module_type: str, defaults: DefaultConfig
+) -> ModuleConfig:
+    # Instance variables (AWS_EU_*) win over the module type ones (AWS_*).
+    prefixes = [_env_prefix(slug)]
+    if module_type != slug:
+        prefixes.append(_env_prefix(module_type))
+
+    def env(key: str) -> str:
+        return _resolve_env_name(prefixes, key)
+
+    url = os.getenv(env("URL"), _default_url(module_type))
+    interval_seconds = _get_int(env("INTERVAL_SECONDS"), defaults.interval_seconds)
+    timeout_seconds = _get_float(env("TIMEOUT_SECONDS"), defaults.timeout_seconds)
+    user_agent = os.getenv(env("USER_AGENT"), defaults.user_agent)
+    rule_kind = os.getenv(env("RULE_KIND"), "status").lower()
+    rule_value = os.getenv(env("RULE_VALUE"), "major,minor")
+    service_filter = _get_service_filter(env("SERVICE_FILTER"))
+    enabled = _get_bool(env("ENABLED"), True)
+    urls = _get_list(env("URLS")) or ([url] if url else [])
+    parse_mode = os.getenv(env("PARSE_MODE"), "").strip().lower()
+    feed_url = os.getenv(env("FEED_URL"), _default_feed_url(module_type))
 
     return ModuleConfig(
         slug=slug,
@@ -110,9 +224,25 @@ def _load_module_config(slug: str, defaults: DefaultConfig) -> ModuleConfig:
         rule=RuleConfig(kind=rule_kind, value=rule_value),
         service_filter=service_filter,
         enabled=enabled,
+        urls=urls,
+        module_type=module_type,
+        parse_mode=parse_mode,
+        feed_url=feed_url,
     )
 
 
+def _env_prefix(slug: str) -> str:
+    return re.sub(r"[^A-Z0-9]+", "_", slug.upper()).strip("_")
+
+
+def _resolve_env_name(prefixes: List[str], key: str) -> str:
+    for prefix in prefixes:
+        name = f"{prefix}_{key}"
+        if os.getenv(name) is not None:
+            return name
+    return f"{prefixes[0]}_{key}"
+
+
 def _default_url(slug: str) -> str:
     if slug.lower() == "steam":
         return "https://steamstat.us/"
@@ -128,7 +258,14 @@ def _default_url(slug: str) -> str:
         return "https://health.aws.amazon.com/public/currentevents"
     if slug.lower() == "gcp":
         return "https://status.cloud.google.com/incidents.json"
-    return f"https://{slug}.example.com/"
+    # Generic engines (statuspage) have no sensible default page.
+    return ""
+
+
+def _default_feed_url(slug: str) -> str:
+    if slug.lower() == "steam":
+        return "https://crowbar.steamstat.us/gravity.json"
+    return ""
 
 
 def _get_int(env_name: str, default: int) -> int:
@@ -158,6 +295,11 @@ def _get_service_filter(env_name: str) -> List[str]:
     return [item.strip().lower() for item in raw.split(",") if item.strip()]
 
 
+def _get_list(env_name: str) -> List[str]:
+    raw = os.getenv(env_name, "")
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
 def _get_bool(env_name: str, default: bool) -> bool:
     raw = os.getenv(env_name)
     if raw is None:
@@ -170,6 +312,35 @@ def _get_bool(env_name: str, default: bool) -> bool:
     return default
 
 
+def _load_webhook_targets() -> List[WebhookTargetConfig]:
+    # `WEBHOOK_TARGETS=incident,lake` reads WEBHOOK_INCIDENT_* and
+    # WEBHOOK_LAKE_*; without it the plain WEBHOOK_* variables form a single
+    # target named `default`.
+    names = [name.lower() for name in _get_list("WEBHOOK_TARGETS")]
+    if not names:
+        return [_load_webhook_target("default", "WEBHOOK")]
+    return [
+        _load_webhook_target(name, f"WEBHOOK_{_env_prefix(name)}") for name in names
+    ]
+
+
+def _load_webhook_target(name: str, prefix: str) -> WebhookTargetConfig:
+    headers = {}
+    for item in _get_list(f"{prefix}_HEADERS"):
+        key, _, value = item.partition("=")
+        if key.strip():
+            headers[key.strip()] = value.strip()
+    return WebhookTargetConfig(
+        name=name,
+        url=os.getenv(f"{prefix}_URL"),
+        token=os.getenv(f"{prefix}_TOKEN"),
+        header_name=os.getenv(f"{prefix}_HEADER_NAME", "Authorization"),
+        headers=headers,
+        modules=_get_list(f"{prefix}_MODULES"),
+        statuses=[status.upper() for status in _get_list(f"{prefix}_STATUSES")],
+    )
+
+
 def _load_notification_config() -> NotificationConfig:
     chat_ids_env = os.getenv("TELEGRAM_CHAT_IDS")
     if chat_ids_env:
@@ -187,16 +358,56 @@ def _load_notification_config() -> NotificationConfig:
             "TELEGRAM_TIMESTAMP_FORMAT", "%Y-%m-%d %H:%M:%S %Z"
         ),
         timestamp_zone=os.getenv("TELEGRAM_TIMESTAMP_ZONE", "UTC"),
+        rate_global_per_second=_get_float("TELEGRAM_RATE_GLOBAL_PER_SECOND", 30.0),
+        rate_chat_per_second=_get_float("TELEGRAM_RATE_CHAT_PER_SECOND", 1.0),
+        rate_group_per_minute=_get_float("TELEGRAM_RATE_GROUP_PER_MINUTE", 20.0),
+        max_retries=max(_get_int("TELEGRAM_MAX_RETRIES", 5), 0),
     )
     webhook = WebhookConfig(
         enabled=_get_bool("WEBHOOK_ENABLED", False),
-        url=os.getenv("WEBHOOK_URL"),
-        token=os.getenv("WEBHOOK_TOKEN"),
-        header_name=os.getenv("WEBHOOK_HEADER_NAME", "Authorization"),
+        targets=_load_webhook_targets(),
+        max_connections=max(_get_int("WEBHOOK_MAX_CONNECTIONS", 20), 1),
+        outbox_path=os.getenv("WEBHOOK_OUTBOX_PATH", "").strip(),
+        max_attempts=max(_get_int("WEBHOOK_MAX_ATTEMPTS", 20), 0),
+        retry_base_seconds=max(_get_float("WEBHOOK_RETRY_BASE_SECONDS", 2.0), 0.1),
+        retry_max_seconds=max(_get_float("WEBHOOK_RETRY_MAX_SECONDS", 300.0), 0.1),
+        batch_seconds=max(_get_float("WEBHOOK_BATCH_SECONDS", 0.0), 0.0),
+        batch_max_events=max(_get_int("WEBHOOK_BATCH_MAX_EVENTS", 100), 1),
+        gzip_min_bytes=max(_get_int("WEBHOOK_GZIP_MIN_BYTES", 0), 0),
     )
     repeat_minutes = _get_int("NOTIFICATION_REPEAT_MINUTES", 10)
     if repeat_minutes < 1:
         repeat_minutes = 1
+    policy = os.getenv("NOTIFICATION_QUEUE_POLICY", "drop_oldest").strip().lower()
+    if policy not in {"block", "drop_oldest", "drop_newest"}:
+        policy = "drop_oldest"
+    queue = NotificationQueueConfig(
+        max_size=max(_get_int("NOTIFICATION_QUEUE_SIZE", 1000), 1),
+        workers=max(_get_int("NOTIFICATION_WORKERS", 4), 1),
+        policy=policy,
+        merge=_get_bool("NOTIFICATION_QUEUE_MERGE", True),
+    )
+    state_backend = os.getenv("NOTIFICATION_STATE_BACKEND", "memory").strip().lower()
+    if state_backend not in {"memory", "file"}:
+        state_backend = "memory"
+    state = AlertStateConfig(
+        backend=state_backend,
+        path=os.getenv("NOTIFICATION_STATE_PATH", "").strip() or "data/alert-state.json",
+        compact_records=max(_get_int("NOTIFICATION_STATE_COMPACT_RECORDS", 1000), 1),
+        ttl_seconds=max(_get_float("NOTIFICATION_STATE_TTL_SECONDS", 86400.0), 0.0),
+        max_entries=max(_get_int("NOTIFICATION_STATE_MAX_ENTRIES", 100000), 0),
+        report_seconds=max(_get_float("NOTIFICATION_STATE_REPORT_SECONDS", 300.0), 0.0),
+    )
+    digest_scope = os.getenv("NOTIFICATION_DIGEST_SCOPE", "module").strip().lower()
+    if digest_scope not in {"module", "global"}:
+        digest_scope = "module"
     return NotificationConfig(
-        telegram=telegram, webhook=webhook, repeat_minutes=repeat_minutes
+        telegram=telegram,
+        webhook=webhook,
+        repeat_minutes=repeat_minutes,
+        queue=queue,
+        fanout_concurrency=max(_get_int("NOTIFICATION_FANOUT_CONCURRENCY", 10), 1),
+        state=state,
+        digest_seconds=max(_get_float("NOTIFICATION_DIGEST_SECONDS", 0.0), 0.0),
+        digest_scope=digest_scope,
     )
@@ -0,0 +1,317 @@
+"""Small JSONPath-style predicate language for `RULE_KIND=expr`.
+
+An expression is parsed once and compiled into nested closures; evaluation
+is a plain walk over the already-decoded document. Examples::
+
+    components[?group=='API'].status in ['major_outage', 'partial_outage']
+    [?severity=='major' && id != 'pageviews'].name
+    status.indicator != 'none' || incidents[0].impact in ['major', 'critical']
+
+Paths select a list of nodes: `.name` / `['name']` read a field (lists are
+projected, so `components.status` reads every component), `*` expands all
+children, `[n]` indexes a list and `[?predicate]` keeps the children for
+which the predicate holds. Inside a filter, paths are relative to the
+child (`@` names it explicitly); `$` is always the document root. A
+comparison holds when any selected node satisfies it; a bare path holds
+when any selected node is truthy.
+"""
+
+import re
+from typing import Any, Callable, List, Optional, Sequence
+
+Node = Any
+PathFn = Callable[[Node, Node], List[Node]]
+PredicateFn = Callable[[Node, Node], List[Node]]
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<op>==|!=|<=|>=|&&|\|\||[<>!()\[\].,?@$*])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_\-]*)
+    )
+    """,
+    re.VERBOSE,
+)
+_LITERALS = {"true": True, "false": False, "null": None}
+_COMPARATORS = {
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+    "in": lambda left, right: left in right,
+    "not in": lambda left, right: left not in right,
+}
+
+
+class ExprError(ValueError):
+    pass
+
+
+class CompiledExpr:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        parser = _Parser(_tokenize(source))
+        self._predicate = parser.parse()
+
+    def matches(self, document: Node) -> List[Node]:
+        """Return the nodes that satisfied the expression (empty when false)."""
+        return self._predicate(document, document)
+
+
+def compile_expr(source: str) -> CompiledExpr:
+    return CompiledExpr(source)
+
+
+def _tokenize(source: str) -> List[tuple[str, Any]]:
+    tokens: List[tuple[str, Any]] = []
+    pos = 0
+    source = source.rstrip()
+    while pos < len(source):
+        match = _TOKEN_PATTERN.match(source, pos)
+        if match is None or match.end() == pos:
+            raise ExprError(f"unexpected character at position {pos}: {source[pos:pos + 10]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "string":
+            tokens.append(("literal", _unquote(text)))
+        elif kind == "number":
+            tokens.append(("literal", float(text) if "." in text else int(text)))
+        elif kind == "name" and text in _LITERALS:
+            tokens.append(("literal", _LITERALS[text]))
+        else:
+            tokens.append((kind, text))
+    tokens.append(("end", None))
+    return tokens
+
+
+def _unquote(text: str) -> str:
+    return re.sub(r"\\(.)", r"\1", text[1:-1])
+
+
+class _Parser:
+    def __init__(self, tokens: List[tuple[str, Any]]) -> None:
+        self._tokens = tokens
+        self._pos = 0
+
+    def parse(self) -> PredicateFn:
+        predicate = self._or()
+        if self._peek() != ("end", None):
+            raise ExprError(f"unexpected token {self._peek()[1]!r}")
+        return predicate
+
+    def _peek(self, offset: int = 0) -> tuple[str, Any]:
+        return self._tokens[min(self._pos + offset, len(self._tokens) - 1)]
+
+    def _accept(self, *values: str) -> Optional[str]:
+        kind, text = self._peek()
+        if kind in {"op", "name"} and text in values:
+            self._pos += 1
+            return text
+        return None
+
+    def _expect(self, value: str) -> None:
+        if self._accept(value) is None:
+            raise ExprError(f"expected {value!r}, found {self._peek()[1]!r}")
+
+    def _or(self) -> PredicateFn:
+        terms = [self._and()]
+        while self._accept("||", "or"):
+            terms.append(self._and())
+        if len(terms) == 1:
+            return terms[0]
+
+        def _any(node: Node, root: Node) -> List[Node]:
+            matched: List[Node] = []
+            for term in terms:
+                matched.extend(term(node, root))
+            return matched
+
+        return _any
+
+    def _and(self) -> PredicateFn:
+        terms = [self._unary()]
+        while self._accept("&&", "and"):
+            terms.append(self._unary())
+        if len(terms) == 1:
+            return terms[0]
+
+        def _all(node: Node, root: Node) -> List[Node]:
+            matched: List[Node] = []
+            for term in terms:
+                hits = term(node, root)
+                if not hits:
+                    return []
+                matched.extend(hits)
+            return matched
+
+        return _all
+
+    def _unary(self) -> PredicateFn:
+        if self._peek() in {("op", "!"), ("name", "not")}:
+            self._pos += 1
+            inner = self._unary()
+            return lambda node, root: [] if inner(node, root) else [True]
+        if self._accept("("):
+            inner = self._or()
+            self._expect(")")
+            return inner
+        return self._comparison()
+
+    def _comparison(self) -> PredicateFn:
+        path = self._path()
+        operator = self._accept("==", "!=", "<=", ">=", "<", ">", "in")
+        if operator is None and self._peek() == ("name", "not") and self._peek(1) == ("name", "in"):
+            self._pos += 2
+            operator = "not in"
+        if operator is None:
+            return lambda node, root: [value for value in path(node, root) if value]
+
+        operand = self._operand()
+        compare = _COMPARATORS[operator]
+
+        def _compare(node: Node, root: Node) -> List[Node]:
+            matched: List[Node] = []
+            for value in path(node, root):
+                try:
+                    if compare(value, operand):
+                        matched.append(value)
+                except TypeError:
+                    continue
+            return matched
+
+        return _compare
+
+    def _operand(self) -> Any:
+        if self._accept("["):
+            values = []
+            if not self._accept("]"):
+                values.append(self._literal())
+                while self._accept(","):
+                    values.append(self._literal())
+                self._expect("]")
+            return values
+        return self._literal()
+
+    def _literal(self) -> Any:
+        kind, value = self._peek()
+        if kind != "literal":
+            raise ExprError(f"expected a literal, found {value!r}")
+        self._pos += 1
+        return value
+
+    def _path(self) -> PathFn:
+        steps: List[Callable[[List[Node], Node], List[Node]]] = []
+        from_root = False
+        if self._accept("$"):
+            from_root = True
+        elif not self._accept("@"):
+            kind, text = self._peek()
+            if kind == "name":
+                self._pos += 1
+                steps.append(_field_step(text))
+            elif self._accept("*"):
+                steps.append(_wildcard_step)
+            elif self._peek() != ("op", "["):
+                raise ExprError(f"expected a path, found {text!r}")
+
+        while True:
+            if self._accept("."):
+                kind, text = self._peek()
+                if self._accept("*"):
+                    steps.append(_wildcard_step)
+                elif kind == "name":
+                    self._pos += 1
+                    steps.append(_field_step(text))
+                else:
+                    raise ExprError(f"expected a field name after '.', found {text!r}")
+            elif self._accept("["):
+                steps.append(self._bracket_step())
+                self._expect("]")
+            else:
+                break
+
+        return _chain(steps, from_root)
+
+    def _bracket_step(self) -> Callable[[List[Node], Node], List[Node]]:
+        if self._accept("*"):
+            return _wildcard_step
+        if self._accept("?"):
+            return _filter_step(self._or())
+        value = self._literal()
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ExprError(f"unsupported subscript {value!r}")
+        if isinstance(value, int):
+            return _index_step(value)
+        return _field_step(value)
+
+
+def _chain(
+    steps: Sequence[Callable[[List[Node], Node], List[Node]]], from_root: bool
+) -> PathFn:
+    def _select(node: Node, root: Node) -> List[Node]:
+        nodes = [root if from_root else node]
+        for step in steps:
+            nodes = step(nodes, root)
+            if not nodes:
+                break
+        return nodes
+
+    return _select
+
+
+def _field_step(name: str) -> Callable[[List[Node], Node], List[Node]]:
+    def _field(nodes: List[Node], root: Node) -> List[Node]:
+        selected: List[Node] = []
+        for node in nodes:
+            if isinstance(node, dict):
+                if name in node:
+                    selected.append(node[name])
+            elif isinstance(node, list):
+                selected.extend(
+                    item[name] for item in node if isinstance(item, dict) and name in item
+                )
+        return selected
+
+    return _field
+
+
+def _wildcard_step(nodes: List[Node], root: Node) -> List[Node]:
+    selected: List[Node] = []
+    for node in nodes:
+        if isinstance(node, dict):
+            selected.extend(node.values())
+        elif isinstance(node, list):
+            selected.extend(node)
+    return selected
+
+
+def _index_step(index: int) -> Callable[[List[Node], Node], List[Node]]:
+    def _index(nodes: List[Node], root: Node) -> List[Node]:
+        selected: List[Node] = []
+        for node in nodes:
+            if isinstance(node, list) and -len(node) <= index < len(node):
+                selected.append(node[index])
+        return selected
+
+    return _index
+
+
+def _filter_step(predicate: PredicateFn) -> Callable[[List[Node], Node], List[Node]]:
+    def _filter(nodes: List[Node], root: Node) -> List[Node]:
+        selected: List[Node] = []
+        for node in nodes:
+            if isinstance(node, dict):
+                children = list(node.values())
+            elif isinstance(node, list):
+                children = node
+            else:
+                continue
+            selected.extend(child for child in children if predicate(child, root))
+        return selected
+
+    return _filter
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .types import MonitorResult, MonitorStatus
+
+
+@dataclass
+class FetchEntry:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fingerprint: Optional[bytes] = None
+    result: Optional[MonitorResult] = None
+
+
+@dataclass
+class FetchResult:
+    response: httpx.Response
+    entry: Optional[FetchEntry]
+    unchanged: bool
+    fingerprint: Optional[bytes] = None
+
+
+class RequestLimiter:
+    """Caps requests in flight overall and against one URL host (0 disables a cap).
+
+    Applied around each request rather than each check, so a module that
+    polls several hosts holds a slot only on the host it is talking to. The
+    host slot is taken first: a request queued behind a busy host never sits
+    on a global slot that requests to other hosts could use.
+    """
+
+    def __init__(self, max_concurrency: int = 0, max_per_host: int = 0) -> None:
+        self.max_per_host = max_per_host
+        self._global = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            for semaphore in (self._host_semaphore(url), self._global):
+                if semaphore is not None:
+                    await stack.enter_async_context(semaphore)
+            yield
+
+    def track(self) -> "TrackedLimiter":
+        return TrackedLimiter(self)
+
+    def _host_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        host = urlsplit(url).hostname
+        if self.max_per_host <= 0 or not host:
+            return None
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._hosts[host] = semaphore
+        return semaphore
+
+
+class TrackedLimiter(RequestLimiter):
+    """Per-check view of a `RequestLimiter` that measures time spent queued.
+
+    It shares the parent's semaphores. Time counts as queued only while a
+    request is waiting for a slot and none of the check's requests is in
+    flight, so pages fetched concurrently are not counted twice.
+    """
+
+    def __init__(self, limiter: RequestLimiter) -> None:
+        self.max_per_host = limiter.max_per_host
+        self._global = limiter._global
+        self._hosts = limiter._hosts
+        self._waiting = 0
+        self._active = 0
+        self._stalled_since: Optional[float] = None
+        self._queued = 0.0
+
+    @property
+    def queue_ms(self) -> float:
+        return self._queued * 1000
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        self._update(waiting=1)
+        acquired = False
+        try:
+            async with super().slot(url):
+                acquired = True
+                self._update(waiting=-1, active=1)
+                yield
+        finally:
+            if acquired:
+                self._update(active=-1)
+            else:
+                self._update(waiting=-1)
+
+    def _update(self, waiting: int = 0, active: int = 0) -> None:
+        now = time.perf_counter()
+        if self._stalled_since is not None:
+            self._queued += now - self._stalled_since
+        self._waiting += waiting
+        self._active += active
+        self._stalled_since = now if self._waiting and not self._active else None
+
+
+_UNLIMITED = RequestLimiter()
+
+
+class ConditionalFetcher:
+    """Per-monitor HTTP fetcher that skips unchanged bodies.
+
+    A body is unchanged when the server answers ``304 Not Modified`` to the
+    stored validators or when its bytes hash to the stored fingerprint.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, FetchEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        timeout: float,
+        headers: Dict[str, str],
+        limiter: Optional[RequestLimiter] = None,
+    ) -> FetchResult:
+        entry = self._entries.get(url)
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        async with (limiter or _UNLIMITED).slot(url):
+            response = await http_client.get(url, timeout=timeout, headers=request_headers)
+        fingerprint = None
+        unchanged = False
+        if entry is not None and response.status_code == 304:
+            unchanged = True
+        elif response.is_success:
+            fingerprint = _fingerprint(response.content)
+            unchanged = entry is not None and entry.fingerprint == fingerprint
+
+        if unchanged:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return FetchResult(
+            response=response,
+            entry=entry,
+            unchanged=unchanged,
+            fingerprint=fingerprint,
+        )
+
+    def store(
+        self,
+        url: str,
+        fetched: FetchResult,
+        result: MonitorResult,
+    ) -> None:
+        # Errors are never replayed; the next poll must hit the parser again.
+        if result.status == MonitorStatus.ERROR:
+            self._entries.pop(url, None)
+            return
+
+        response = fetched.response
+        fingerprint = fetched.fingerprint
+        if fingerprint is None:
+            fingerprint = _fingerprint(response.content)
+        self._entries[url] = FetchEntry(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fingerprint=fingerprint,
+            result=result,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
+
+
+def replay_result(entry: FetchEntry, duration_ms: float) -> MonitorResult:
+    """Return the cached result of an unchanged document with a fresh duration."""
+    return replace(entry.result, duration_ms=round(duration_ms, 2), changes=None)
+
+
+def _fingerprint(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
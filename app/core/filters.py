@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, Optional, Set
+
+from .automaton import KeywordAutomaton
+
+
+class ServiceFilter:
+    """`SERVICE_FILTER` entries compiled once into lookup indexes.
+
+    `foo` matches exactly, `foo*` matches values starting with `foo` and
+    `*foo*` (or `*foo`) matches values containing `foo`; comparisons ignore
+    case. Exact entries are a set lookup, prefixes are bucketed by length so
+    a value is sliced once per distinct prefix length, and substrings share
+    one Aho-Corasick pass. Modules whose filter historically matched
+    substrings (OCI) build it with `substring_default=True`, which treats
+    plain entries as `*foo*`.
+    """
+
+    def __init__(self, entries: Iterable[str], substring_default: bool = False) -> None:
+        self.entries = [entry.strip().lower() for entry in entries if entry.strip()]
+        self._exact: Set[str] = set()
+        self._prefixes: Dict[int, Set[str]] = {}
+        substrings = []
+
+        for entry in self.entries:
+            if entry.startswith("*"):
+                term = entry.strip("*")
+                if term:
+                    substrings.append(term)
+            elif entry.endswith("*"):
+                term = entry.rstrip("*")
+                self._prefixes.setdefault(len(term), set()).add(term)
+            elif substring_default:
+                substrings.append(entry)
+            else:
+                self._exact.add(entry)
+
+        # Entries such as `*` match everything; keep them as an empty prefix.
+        if any(entry.strip("*") == "" for entry in self.entries):
+            self._prefixes.setdefault(0, set()).add("")
+        self._prefix_lengths = sorted(self._prefixes)
+        self._substrings: Optional[KeywordAutomaton] = (
+            KeywordAutomaton(substrings, binary=False) if substrings else None
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def matches(self, *values: Optional[str]) -> bool:
+        """True when the filter is empty or any of `values` matches an entry."""
+        if not self.entries:
+            return True
+        for value in values:
+            if not value:
+                continue
+            folded = value.lower()
+            if folded in self._exact:
+                return True
+            for length in self._prefix_lengths:
+                if length > len(folded):
+                    break
+                if folded[:length] in self._prefixes[length]:
+                    return True
+            if self._substrings is not None and self._substrings.search(folded):
+                return True
+        return False
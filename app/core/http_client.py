@@ -1,10 +1,36 @@
+import importlib.util
+import logging
+from typing import Optional
+
 import httpx
 
+from .config import HttpConfig
+
 
 def create_http_client(
     timeout_seconds: float,
     user_agent: str,
+    http_config: Optional[HttpConfig] = None,
+    logger: Optional[logging.Logger] = None,
 ) -> httpx.AsyncClient:
     headers = {"User-Agent": user_agent}
-    return httpx.AsyncClient(timeout=timeout_seconds, headers=headers)
+    if http_config is None:
+        return httpx.AsyncClient(timeout=timeout_seconds, headers=headers)
 
+    limits = httpx.Limits(
+        max_connections=http_config.max_connections or None,
+        max_keepalive_connections=http_config.max_keepalive_connections or None,
+        keepalive_expiry=http_config.keepalive_expiry_seconds,
+    )
+    http2 = http_config.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        # HTTP/2 needs the optional `h2` package (httpx[http2]).
+        if logger is not None:
+            logger.warning(
+                "http2 requested but h2 is not installed; using HTTP/1.1",
+                extra={"event": "startup"},
+            )
+        http2 = False
+    return httpx.AsyncClient(
+        timeout=timeout_seconds, headers=headers, limits=limits, http2=http2
+    )
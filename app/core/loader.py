@@ -1,5 +1,5 @@
 import importlib
-from typing import List, Tuple
+from typing import Callable, Dict, List, Tuple
 import logging
 
 from .config import ModuleConfig
@@ -9,6 +9,7 @@ def load_monitors(
     module_configs: List[ModuleConfig], logger: logging.Logger
 ) -> List[Tuple[object, ModuleConfig]]:
     monitors: List[Tuple[object, ModuleConfig]] = []
+    factories: Dict[str, Callable[[str], object]] = {}
 
     for config in module_configs:
         if hasattr(config, "enabled") and not config.enabled:
@@ -21,12 +22,12 @@ def load_monitors(
             )
             continue
 
-        module_path = f"app.modules.{config.slug}.monitor"
+        module_type = config.module_type or config.slug
         try:
-            loaded_module = importlib.import_module(module_path)
-            factory = getattr(loaded_module, "get_monitor", None)
+            factory = factories.get(module_type)
             if factory is None:
-                raise ImportError(f"missing get_monitor() in {module_path}")
+                factory = _import_factory(module_type)
+                factories[module_type] = factory
             monitor = factory(config.slug)
             configure = getattr(monitor, "configure", None)
             if callable(configure):
@@ -37,6 +38,7 @@ def load_monitors(
                 extra={
                     "event": "module_load",
                     "module_id": config.slug,
+                    "module_type": module_type,
                     "interval_seconds": config.interval_seconds,
                     "timeout_seconds": config.timeout_seconds,
                 },
@@ -47,8 +49,18 @@ def load_monitors(
                 extra={
                     "event": "module_load",
                     "module_id": config.slug,
+                    "module_type": module_type,
                     "status": "ERROR",
                     "reason": str(exc),
                 },
             )
     return monitors
+
+
+def _import_factory(module_type: str) -> Callable[[str], object]:
+    module_path = f"app.modules.{module_type}.monitor"
+    loaded_module = importlib.import_module(module_path)
+    factory = getattr(loaded_module, "get_monitor", None)
+    if factory is None:
+        raise ImportError(f"missing get_monitor() in {module_path}")
+    return factory
@@ -16,10 +16,31 @@ class JsonFormatter(logging.Formatter):
         for key in (
             "event",
             "module_id",
+            "module_type",
+            "target",
+            "chat_id",
+            "targets",
             "status",
             "reason",
             "duration_ms",
+            "lag_ms",
+            "queue_ms",
             "interval_seconds",
+            "changes",
+            "cache_hits",
+            "cache_misses",
+            "queue_depth",
+            "wait_ms",
+            "send_ms",
+            "entries",
+            "alerting",
+            "evicted",
+            "memory_bytes",
+            "sent",
+            "dropped",
+            "merged",
+            "state_entries",
+            "webhook_pending",
         ):
             value = getattr(record, key, None)
             if value is not None:
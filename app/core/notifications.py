@@ -1,31 +1,130 @@
+import asyncio
+import itertools
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 
 import httpx
 
 from .config import ModuleConfig, NotificationConfig
-from .types import MonitorResult, MonitorStatus
+from .state import AlertState, create_state_store
+from .types import DeliveryOutcome, DigestEntry, MonitorResult, MonitorStatus
 from ..notifications.telegram.notifier import TelegramNotifier
 from ..notifications.webhook.notifier import WebhookNotifier
 
+# Longest a check waits for queue room under the `block` policy before the
+# notification is dropped; delivery must not stall the scheduler.
+_BLOCK_TIMEOUT_SECONDS = 1.0
+
 
 class NotificationManager:
     def __init__(self, config: NotificationConfig) -> None:
         self.config = config
         self.telegram_notifier: Optional[TelegramNotifier] = None
         self.webhook_notifier: Optional[WebhookNotifier] = None
-        self._alert_state: dict[str, AlertState] = {}
+        self._states = create_state_store(config.state)
         self._repeat_seconds = max(config.repeat_minutes, 1) * 60
+        # One queue per worker; a service always hashes to the same queue, so
+        # its alerts and recoveries are delivered in the order they were made.
+        shard_size = max(-(-config.queue.max_size // config.queue.workers), 1)
+        self._queues: List[asyncio.Queue["Delivery"]] = [
+            asyncio.Queue(maxsize=shard_size) for _ in range(config.queue.workers)
+        ]
+        # Latest queued delivery per service, for merging.
+        self._pending: Dict[str, "Delivery"] = {}
+        self._workers: List[asyncio.Task] = []
+        self._report: Optional[asyncio.Task] = None
+        self._logger: Optional[logging.Logger] = None
+        self._digests: Dict[str, "DigestBatch"] = {}
+        self._digest_ids = itertools.count(1)
+        # Modules whose persisted alerts were checked against a first result.
+        self._reconciled: set[str] = set()
+        self.sent = 0
+        self.dropped = 0
+        self.merged = 0
         if config.telegram.enabled:
-            self.telegram_notifier = TelegramNotifier(config.telegram)
+            self.telegram_notifier = TelegramNotifier(
+                config.telegram, max_concurrency=config.fanout_concurrency
+            )
         if config.webhook.enabled:
             self.webhook_notifier = WebhookNotifier(config.webhook)
 
     def has_notifiers(self) -> bool:
         return bool(self.telegram_notifier or self.webhook_notifier)
 
+    async def start(self, http_client: httpx.AsyncClient, logger: logging.Logger) -> None:
+        self._logger = logger
+        self._states.load(logger)
+        if self._report is None and self.config.state.report_seconds > 0:
+            self._report = asyncio.create_task(
+                self._report_stats(logger), name="notification-report"
+            )
+        # Without workers, deliveries run inline in the caller.
+        if self._workers or not self.has_notifiers():
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(queue), name=f"notification-worker-{index}")
+            for index, queue in enumerate(self._queues)
+        ]
+        if self.webhook_notifier:
+            await self.webhook_notifier.start(http_client, logger)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        # Open digests are sent now rather than lost with their timers.
+        for scope in list(self._digests):
+            self._digests[scope].timer.cancel()
+            await self._flush_digest(scope)
+        if self._report is not None:
+            self._report.cancel()
+            await asyncio.gather(self._report, return_exceptions=True)
+            self._report = None
+        await self._states.close()
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)), timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._logger is not None:
+            await self._log_stats(self._logger)
+        if self.webhook_notifier:
+            await self.webhook_notifier.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self._queue_depth(),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "state_entries": len(self._states),
+        }
+
+    async def _report_stats(self, logger: logging.Logger) -> None:
+        while True:
+            await asyncio.sleep(self.config.state.report_seconds)
+            # Also sweeps expired entries when no check has touched the table.
+            self._states.evict()
+            logger.info(
+                "alert state stats",
+                extra={"event": "state_stats", **self._states.stats()},
+            )
+            await self._log_stats(logger)
+
+    async def _log_stats(self, logger: logging.Logger) -> None:
+        stats = self.stats()
+        if self.webhook_notifier:
+            # Deliveries still waiting in the outbox for the receiver.
+            stats["webhook_pending"] = await self.webhook_notifier.outbox.pending()
+        logger.info("notification stats", extra={"event": "notify_stats", **stats})
+
     async def handle_result(
         self,
         module_id: str,
@@ -37,6 +136,24 @@ class NotificationManager:
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
     ) -> None:
+        # Incidents the monitor saw disappear are recovered by id: they are
+        # no longer in the payload, which may even be empty by now.
+        changes = result.changes or {}
+        resolved = list(changes.get("resolved") or [])
+        if "resolved" in changes and module_id not in self._reconciled:
+            self._reconciled.add(module_id)
+            resolved.extend(self._stale_alerts(module_id, result))
+        if resolved:
+            await self._resolve_services(
+                module_id,
+                result,
+                resolved,
+                module_config,
+                _ensure_aware(event_time),
+                http_client,
+                logger,
+            )
+
         service_items = _extract_service_items(result.payload)
         if service_items:
             await self._handle_service_result(
@@ -53,7 +170,7 @@ class NotificationManager:
             return
 
         if result.status == MonitorStatus.OK:
-            state = self._alert_state.get(module_id)
+            state = self._states.get(module_id)
             if state is not None and state.last_status == MonitorStatus.ALERT:
                 await self._notify_recovery(
                     module_id,
@@ -65,18 +182,18 @@ class NotificationManager:
                     http_client=http_client,
                     logger=logger,
                 )
-            self._alert_state[module_id] = AlertState(
-                last_status=MonitorStatus.OK, last_alert_at=None
+            self._states.set(
+                module_id, AlertState(last_status=MonitorStatus.OK, last_alert_at=None)
             )
             return
 
         if result.status != MonitorStatus.ALERT:
-            self._alert_state[module_id] = AlertState(
-                last_status=result.status, last_alert_at=None
+            self._states.set(
+                module_id, AlertState(last_status=result.status, last_alert_at=None)
             )
             return
 
-        state = self._alert_state.get(module_id)
+        state = self._states.get(module_id)
         event_time = _ensure_aware(event_time)
         should_send = False
         if state is None or state.last_status != MonitorStatus.ALERT:
@@ -99,8 +216,8 @@ class NotificationManager:
             http_client,
             logger,
         )
-        self._alert_state[module_id] = AlertState(
-            last_status=MonitorStatus.ALERT, last_alert_at=event_time
+        self._states.set(
+            module_id, AlertState(last_status=MonitorStatus.ALERT, last_alert_at=event_time)
         )
 
     async def _handle_service_result(
@@ -118,38 +235,43 @@ class NotificationManager:
         event_time = _ensure_aware(event_time)
         if result.status == MonitorStatus.OK:
             for item in service_items:
-                key = _service_key(module_id, item)
-                state = self._alert_state.get(key)
-                if state is not None and state.last_status == MonitorStatus.ALERT:
-                    recovery_result = _build_service_result(
-                        result, item, MonitorStatus.OK, "service restored"
-                    )
-                    await self._notify_recovery(
-                        module_id,
-                        recovery_result,
-                        module_config,
-                        level_name="INFO",
-                        event_name="service_resolved",
-                        event_time=event_time,
-                        http_client=http_client,
-                        logger=logger,
-                    )
-                self._alert_state[key] = AlertState(
-                    last_status=MonitorStatus.OK, last_alert_at=None
+                await self._recover_service(
+                    module_id,
+                    _service_key(module_id, item),
+                    item,
+                    result,
+                    module_config,
+                    event_time,
+                    http_client,
+                    logger,
                 )
             return
 
         if result.status != MonitorStatus.ALERT:
             for item in service_items:
                 key = _service_key(module_id, item)
-                self._alert_state[key] = AlertState(
-                    last_status=result.status, last_alert_at=None
+                self._states.set(
+                    key, AlertState(last_status=result.status, last_alert_at=None)
                 )
             return
 
         for item in service_items:
             key = _service_key(module_id, item)
-            state = self._alert_state.get(key)
+            # Monitors may report every service and flag the healthy ones, so
+            # a service recovers while others are still alerting.
+            if item.get("alerting") is False:
+                await self._recover_service(
+                    module_id,
+                    key,
+                    item,
+                    result,
+                    module_config,
+                    event_time,
+                    http_client,
+                    logger,
+                )
+                continue
+            state = self._states.get(key)
             should_send = False
             if state is None or state.last_status != MonitorStatus.ALERT:
                 should_send = True
@@ -173,10 +295,79 @@ class NotificationManager:
                 event_time,
                 http_client,
                 logger,
+                key=key,
+            )
+            self._states.set(
+                key, AlertState(last_status=MonitorStatus.ALERT, last_alert_at=event_time)
+            )
+
+    def _stale_alerts(self, module_id: str, result: MonitorResult) -> List[str]:
+        # A monitor's incident index starts empty, so incidents that ended
+        # while the process was down are never reported as resolved. Alerts
+        # restored from the state store that the first result no longer
+        # lists are recovered instead.
+        prefix = f"{module_id}:".lower()
+        active = {
+            _service_key(module_id, item) for item in _extract_service_items(result.payload)
+        }
+        return [
+            key[len(prefix):] for key in self._states.alerting(prefix) if key not in active
+        ]
+
+    async def _resolve_services(
+        self,
+        module_id: str,
+        result: MonitorResult,
+        service_ids: List[str],
+        module_config: ModuleConfig,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> None:
+        for service_id in service_ids:
+            item = {"id": service_id, "status": "resolved"}
+            key = _service_key(module_id, item)
+            if self._states.get(key) is None:
+                continue
+            await self._recover_service(
+                module_id,
+                key,
+                item,
+                result,
+                module_config,
+                event_time,
+                http_client,
+                logger,
             )
-            self._alert_state[key] = AlertState(
-                last_status=MonitorStatus.ALERT, last_alert_at=event_time
+
+    async def _recover_service(
+        self,
+        module_id: str,
+        key: str,
+        item: dict,
+        result: MonitorResult,
+        module_config: ModuleConfig,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> None:
+        state = self._states.get(key)
+        if state is not None and state.last_status == MonitorStatus.ALERT:
+            recovery_result = _build_service_result(
+                result, item, MonitorStatus.OK, "service restored"
+            )
+            await self._notify_recovery(
+                module_id,
+                recovery_result,
+                module_config,
+                level_name="INFO",
+                event_name="service_resolved",
+                event_time=event_time,
+                http_client=http_client,
+                logger=logger,
+                key=key,
             )
+        self._states.set(key, AlertState(last_status=MonitorStatus.OK, last_alert_at=None))
 
     async def _notify_alert(
         self,
@@ -188,9 +379,239 @@ class NotificationManager:
         event_time: datetime,
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
+        key: Optional[str] = None,
+    ) -> None:
+        if key is not None and self._digest_enabled():
+            self._collect(
+                f"alert:{key}",
+                "alert",
+                _digest_entry(
+                    module_id, result, module_config, level_name, event_name, event_time
+                ),
+                http_client,
+                logger,
+            )
+            return
+        await self._submit(
+            Delivery(
+                key=f"alert:{key or module_id}",
+                service=key or module_id,
+                module_id=module_id,
+                logger=logger,
+                send=lambda: self._send_alert(
+                    module_id,
+                    result,
+                    module_config,
+                    level_name,
+                    event_name,
+                    event_time,
+                    http_client,
+                    logger,
+                ),
+            )
+        )
+
+    async def _notify_recovery(
+        self,
+        module_id: str,
+        result: MonitorResult,
+        module_config: ModuleConfig,
+        level_name: str,
+        event_name: str,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+        key: Optional[str] = None,
     ) -> None:
+        if key is not None and self._digest_enabled():
+            self._collect(
+                f"recovery:{key}",
+                "recovery",
+                _digest_entry(
+                    module_id, result, module_config, level_name, event_name, event_time
+                ),
+                http_client,
+                logger,
+            )
+            return
+        await self._submit(
+            Delivery(
+                key=f"recovery:{key or module_id}",
+                service=key or module_id,
+                module_id=module_id,
+                logger=logger,
+                send=lambda: self._send_recovery(
+                    module_id,
+                    result,
+                    module_config,
+                    level_name,
+                    event_name,
+                    event_time,
+                    http_client,
+                    logger,
+                ),
+            )
+        )
+
+    def _digest_enabled(self) -> bool:
+        return self.config.digest_seconds > 0 and self.has_notifiers()
+
+    def _collect(
+        self,
+        key: str,
+        kind: str,
+        entry: DigestEntry,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> None:
+        # Service-level transitions are held for the digest window; the first
+        # one opens the batch and schedules its flush.
+        scope = entry.module_id if self.config.digest_scope == "module" else "global"
+        batch = self._digests.get(scope)
+        if batch is None:
+            batch = DigestBatch(scope=scope, http_client=http_client, logger=logger)
+            batch.timer = asyncio.create_task(self._flush_digest_later(scope))
+            self._digests[scope] = batch
+        # A repeated alert for the same service within the window replaces
+        # the earlier one.
+        target = batch.alerts if kind == "alert" else batch.recoveries
+        target[key] = entry
+
+    async def _flush_digest_later(self, scope: str) -> None:
+        await asyncio.sleep(self.config.digest_seconds)
+        await self._flush_digest(scope)
+
+    async def _flush_digest(self, scope: str) -> None:
+        batch = self._digests.pop(scope, None)
+        if batch is None or not (batch.alerts or batch.recoveries):
+            return
+        key = f"digest:{scope}:{next(self._digest_ids)}"
+        await self._submit(
+            Delivery(
+                key=key,
+                service=key,
+                module_id=scope,
+                logger=batch.logger,
+                send=lambda: self._send_digest(batch),
+            )
+        )
+
+    async def _submit(self, delivery: "Delivery") -> None:
+        if not self.has_notifiers():
+            return
+        if not self._workers:
+            await self._deliver(delivery)
+            return
+
+        # A newer notification replaces one still waiting only when nothing
+        # else for that service was queued after it: an alert queued behind a
+        # recovery must not jump back ahead of it.
+        if self.config.queue.merge:
+            pending = self._pending.get(delivery.service)
+            if pending is not None and pending.key == delivery.key:
+                pending.send = delivery.send
+                self.merged += 1
+                return
+
+        queue = self._queues[hash(delivery.service) % len(self._queues)]
+        if queue.full():
+            policy = self.config.queue.policy
+            if policy == "drop_newest":
+                self._drop(delivery)
+                return
+            if policy == "drop_oldest":
+                oldest = queue.get_nowait()
+                queue.task_done()
+                self._forget(oldest)
+                self._drop(oldest)
+
+        try:
+            await asyncio.wait_for(queue.put(delivery), _BLOCK_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self._drop(delivery)
+            return
+        if self.config.queue.merge:
+            self._pending[delivery.service] = delivery
+
+    async def _worker(self, queue: asyncio.Queue["Delivery"]) -> None:
+        while True:
+            delivery = await queue.get()
+            self._forget(delivery)
+            try:
+                await self._deliver(delivery)
+            finally:
+                queue.task_done()
+
+    def _queue_depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    async def _deliver(self, delivery: "Delivery") -> None:
+        started = time.perf_counter()
+        wait_ms = (started - delivery.enqueued_at) * 1000
+        try:
+            outcomes = await delivery.send()
+        except Exception as exc:  # noqa: BLE001
+            delivery.logger.error(
+                "notification delivery failed",
+                extra={
+                    "event": "notify_error",
+                    "module_id": delivery.module_id,
+                    "reason": str(exc),
+                },
+            )
+            return
+        send_ms = (time.perf_counter() - started) * 1000
+        self.sent += 1
+        failed = [outcome for outcome in outcomes if not (outcome.ok or outcome.queued)]
+        status = "ok"
+        if failed:
+            status = "partial"
+        elif any(outcome.queued for outcome in outcomes):
+            status = "queued"
+        delivery.logger.log(
+            logging.WARNING if failed else logging.INFO,
+            "notification delivered",
+            extra={
+                "event": "notify_delivery",
+                "module_id": delivery.module_id,
+                "status": status,
+                "queue_depth": self._queue_depth(),
+                "wait_ms": round(wait_ms, 2),
+                "send_ms": round(send_ms, 2),
+                "targets": {outcome.target: _outcome_label(outcome) for outcome in outcomes},
+            },
+        )
+
+    def _forget(self, delivery: "Delivery") -> None:
+        if self._pending.get(delivery.service) is delivery:
+            del self._pending[delivery.service]
+
+    def _drop(self, delivery: "Delivery") -> None:
+        self.dropped += 1
+        delivery.logger.warning(
+            "notification queue full; dropping notification",
+            extra={
+                "event": "notify_drop",
+                "module_id": delivery.module_id,
+                "reason": self.config.queue.policy,
+                "queue_depth": self._queue_depth(),
+            },
+        )
+
+    async def _send_alert(
+        self,
+        module_id: str,
+        result: MonitorResult,
+        module_config: ModuleConfig,
+        level_name: str,
+        event_name: str,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> List[DeliveryOutcome]:
+        sends = {}
         if self.telegram_notifier:
-            await self.telegram_notifier.send_alert(
+            sends["telegram"] = self.telegram_notifier.send_alert(
                 module_id=module_id,
                 result=result,
                 interval_seconds=module_config.interval_seconds,
@@ -199,9 +620,10 @@ class NotificationManager:
                 event_time=event_time,
                 http_client=http_client,
                 logger=logger,
+                module_type=module_config.module_type or None,
             )
         if self.webhook_notifier:
-            await self.webhook_notifier.send_alert(
+            sends["webhook"] = self.webhook_notifier.send_alert(
                 module_id=module_id,
                 result=result,
                 interval_seconds=module_config.interval_seconds,
@@ -211,8 +633,9 @@ class NotificationManager:
                 http_client=http_client,
                 logger=logger,
             )
+        return await _fan_out(sends)
 
-    async def _notify_recovery(
+    async def _send_recovery(
         self,
         module_id: str,
         result: MonitorResult,
@@ -222,9 +645,10 @@ class NotificationManager:
         event_time: datetime,
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
-    ) -> None:
+    ) -> List[DeliveryOutcome]:
+        sends = {}
         if self.telegram_notifier:
-            await self.telegram_notifier.send_recovery(
+            sends["telegram"] = self.telegram_notifier.send_recovery(
                 module_id=module_id,
                 result=result,
                 interval_seconds=module_config.interval_seconds,
@@ -235,7 +659,7 @@ class NotificationManager:
                 logger=logger,
             )
         if self.webhook_notifier:
-            await self.webhook_notifier.send_recovery(
+            sends["webhook"] = self.webhook_notifier.send_recovery(
                 module_id=module_id,
                 result=result,
                 interval_seconds=module_config.interval_seconds,
@@ -245,12 +669,93 @@ class NotificationManager:
                 http_client=http_client,
                 logger=logger,
             )
+        return await _fan_out(sends)
+
+    async def _send_digest(self, batch: "DigestBatch") -> List[DeliveryOutcome]:
+        alerts = list(batch.alerts.values())
+        recoveries = list(batch.recoveries.values())
+        event_time = datetime.now(timezone.utc)
+        sends = {}
+        if self.telegram_notifier:
+            sends["telegram"] = self.telegram_notifier.send_digest(
+                scope=batch.scope,
+                alerts=alerts,
+                recoveries=recoveries,
+                window_seconds=self.config.digest_seconds,
+                event_time=event_time,
+                http_client=batch.http_client,
+                logger=batch.logger,
+            )
+        if self.webhook_notifier:
+            sends["webhook"] = self.webhook_notifier.send_digest(
+                scope=batch.scope,
+                alerts=alerts,
+                recoveries=recoveries,
+                window_seconds=self.config.digest_seconds,
+                event_time=event_time,
+                http_client=batch.http_client,
+                logger=batch.logger,
+            )
+        return await _fan_out(sends)
+
+
+async def _fan_out(
+    sends: Dict[str, Awaitable[List[DeliveryOutcome]]]
+) -> List[DeliveryOutcome]:
+    # Backends run concurrently; a backend that raises counts as one failed target.
+    results = await asyncio.gather(*sends.values(), return_exceptions=True)
+    outcomes: List[DeliveryOutcome] = []
+    for backend, result in zip(sends, results):
+        if isinstance(result, BaseException):
+            outcomes.append(DeliveryOutcome(backend, False, str(result)))
+        else:
+            outcomes.extend(result)
+    return outcomes
 
 
 @dataclass
-class AlertState:
-    last_status: MonitorStatus
-    last_alert_at: Optional[datetime]
+class Delivery:
+    key: str
+    # Deliveries for the same service share a queue and are sent in order.
+    service: str
+    module_id: str
+    logger: logging.Logger
+    send: Callable[[], Awaitable[List[DeliveryOutcome]]]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class DigestBatch:
+    scope: str
+    http_client: httpx.AsyncClient
+    logger: logging.Logger
+    alerts: Dict[str, DigestEntry] = field(default_factory=dict)
+    recoveries: Dict[str, DigestEntry] = field(default_factory=dict)
+    timer: Optional[asyncio.Task] = None
+
+
+def _outcome_label(outcome: DeliveryOutcome) -> str:
+    if outcome.ok:
+        return "ok"
+    return "queued" if outcome.queued else "failed"
+
+
+def _digest_entry(
+    module_id: str,
+    result: MonitorResult,
+    module_config: ModuleConfig,
+    level_name: str,
+    event_name: str,
+    event_time: datetime,
+) -> DigestEntry:
+    return DigestEntry(
+        module_id=module_id,
+        result=result,
+        interval_seconds=module_config.interval_seconds,
+        level_name=level_name,
+        event_name=event_name,
+        event_time=event_time,
+    )
 
 
 def _ensure_aware(value: datetime) -> datetime:
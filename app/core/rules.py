@@ -0,0 +1,98 @@
+import re
+from typing import Any, Optional
+
+from .automaton import KeywordAutomaton
+from .config import RuleConfig
+from .expr import CompiledExpr, ExprError, compile_expr
+from .types import MonitorStatus
+
+TEXT_RULE_KINDS = {"keyword", "regex"}
+_REASON_VALUES = 5
+
+
+class CompiledRule:
+    """A module `RuleConfig` compiled once at `configure()` time.
+
+    Text rules (`keyword`, `regex`) search the raw response bytes, so modules
+    neither decode nor re-serialize the document to evaluate them. A
+    comma-separated `keyword` value is compiled into a multi-term automaton
+    that reports every term found in one pass. `expr` rules are compiled to
+    closures (see `expr.py`) and run against the module's parsed document.
+    `status` rules stay in the modules.
+    """
+
+    def __init__(self, rule: RuleConfig) -> None:
+        self.kind = rule.kind
+        self.value = rule.value
+        self.label = rule.value
+        self.error: Optional[str] = None
+        self._pattern: Optional[re.Pattern[bytes]] = None
+        self._automaton: Optional[KeywordAutomaton] = None
+        self._expr: Optional[CompiledExpr] = None
+
+        if self.kind == "keyword" and self.value:
+            terms = [term.strip() for term in self.value.split(",") if term.strip()]
+            if len(terms) > 1:
+                self._automaton = KeywordAutomaton(terms)
+            elif terms:
+                self.label = terms[0]
+                self._pattern = re.compile(re.escape(terms[0].encode("utf-8")), re.IGNORECASE)
+        elif self.kind == "regex" and self.value:
+            try:
+                self._pattern = re.compile(self.value.encode("utf-8"), re.IGNORECASE)
+            except re.error as exc:
+                self.error = f"invalid regex: {exc}"
+        elif self.kind == "expr":
+            try:
+                self._expr = compile_expr(self.value)
+            except ExprError as exc:
+                self.error = f"invalid expr: {exc}"
+
+    @property
+    def is_text(self) -> bool:
+        return self.kind in TEXT_RULE_KINDS
+
+    @property
+    def is_expr(self) -> bool:
+        return self.kind == "expr"
+
+    def evaluate(self, data: Any) -> tuple[MonitorStatus, Optional[str]]:
+        """Evaluate the rule; `data` is the raw body for text rules and the
+        parsed document for `expr` rules."""
+        if not self.is_text and not self.is_expr:
+            return MonitorStatus.ERROR, f"unsupported rule kind '{self.kind}'"
+        if self.error is not None:
+            return MonitorStatus.ERROR, self.error
+        if self._expr is not None:
+            return self._evaluate_expr(data)
+        if self._automaton is not None:
+            found = self._automaton.find(data)
+            if not found:
+                return MonitorStatus.OK, None
+            return MonitorStatus.ALERT, "keywords detected: " + ", ".join(
+                f"'{term}'" for term in found
+            )
+        if self._pattern is None or self._pattern.search(data) is None:
+            return MonitorStatus.OK, None
+        if self.kind == "keyword":
+            return MonitorStatus.ALERT, f"keyword '{self.label}' detected"
+        return MonitorStatus.ALERT, f"regex '{self.value}' matched"
+
+    def _evaluate_expr(self, document: Any) -> tuple[MonitorStatus, Optional[str]]:
+        matched = self._expr.matches(document)
+        if not matched:
+            return MonitorStatus.OK, None
+        reason = f"expr '{self.value}' matched"
+        values = [
+            str(value) for value in matched if isinstance(value, (str, int, float))
+        ]
+        if values:
+            shown = ", ".join(values[:_REASON_VALUES])
+            if len(values) > _REASON_VALUES:
+                shown += f" (+{len(values) - _REASON_VALUES} more)"
+            reason = f"{reason}: {shown}"
+        return MonitorStatus.ALERT, reason
+
+
+def compile_rule(rule: RuleConfig) -> CompiledRule:
+    return CompiledRule(rule)
@@ -1,110 +1,270 @@
 import asyncio
+import heapq
+import itertools
 import logging
 import time
+import zlib
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import httpcore
 import httpx
 
-from .config import ModuleConfig
+from .config import ModuleConfig, SchedulerConfig
+from .fetch import RequestLimiter
 from .notifications import NotificationManager
 from .types import MonitorResult, MonitorStatus
 
+_CHECK = "check"
+_PREWARM = "prewarm"
+
 
 async def schedule_monitors(
     monitors: List[Tuple[object, ModuleConfig]],
     http_client: httpx.AsyncClient,
     logger: logging.Logger,
     notifier: NotificationManager | None = None,
+    scheduler_config: SchedulerConfig | None = None,
 ) -> None:
-    tasks = [
-        asyncio.create_task(_run_monitor_loop(monitor, config, http_client, logger, notifier))
-        for monitor, config in monitors
-    ]
+    # A single dispatcher pops the next due check from a heap and runs it as a
+    # short-lived task. Next due times are computed from the previous due time,
+    # not from when the check finished, so periods do not drift.
+    if scheduler_config is None:
+        scheduler_config = SchedulerConfig(
+            startup_jitter_seconds=0.0, max_concurrency=0, max_concurrency_per_host=0
+        )
+    limiter = RequestLimiter(
+        scheduler_config.max_concurrency, scheduler_config.max_concurrency_per_host
+    )
+
+    loop = asyncio.get_running_loop()
+    sequence = itertools.count()
+    start = loop.time()
+    queue: List[Tuple[float, int, int, str]] = []
+    for index, (_, config) in enumerate(monitors):
+        due = start + _startup_offset(config, scheduler_config.startup_jitter_seconds)
+        heapq.heappush(queue, (due, next(sequence), index, _CHECK))
 
+    running: Dict[int, asyncio.Task] = {}
+    prewarms: set[asyncio.Task] = set()
     try:
-        await asyncio.gather(*tasks)
+        while queue:
+            due, _, index, kind = queue[0]
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            heapq.heappop(queue)
+            monitor, config = monitors[index]
+            if kind == _PREWARM:
+                task = asyncio.create_task(
+                    _prewarm(monitor, config, http_client, logger, limiter)
+                )
+                prewarms.add(task)
+                task.add_done_callback(prewarms.discard)
+                continue
+
+            now = loop.time()
+            lag_ms = (now - due) * 1000
+
+            previous = running.get(index)
+            if previous is not None and not previous.done():
+                logger.getChild(config.slug).warning(
+                    "previous check still running; skipping tick",
+                    extra={
+                        "event": "monitor_skip",
+                        "module_id": config.slug,
+                        "lag_ms": round(lag_ms, 2),
+                        "interval_seconds": config.interval_seconds,
+                    },
+                )
+            else:
+                running[index] = asyncio.create_task(
+                    _run_check(
+                        monitor, config, http_client, logger, notifier, limiter, lag_ms
+                    )
+                )
+
+            next_due = _next_due(due, now, config)
+            heapq.heappush(queue, (next_due, next(sequence), index, _CHECK))
+            prewarm_at = next_due - scheduler_config.prewarm_seconds
+            if scheduler_config.prewarm_seconds > 0 and prewarm_at > now:
+                heapq.heappush(queue, (prewarm_at, next(sequence), index, _PREWARM))
     except asyncio.CancelledError:
-        for task in tasks:
+        for task in [*running.values(), *prewarms]:
             task.cancel()
         raise
 
 
-async def _run_monitor_loop(
+async def _prewarm(
     monitor: object,
     config: ModuleConfig,
     http_client: httpx.AsyncClient,
     logger: logging.Logger,
-    notifier: NotificationManager | None,
+    limiter: RequestLimiter,
 ) -> None:
-    module_logger = logger.getChild(config.slug)
-    while True:
-        started = time.perf_counter()
+    # A HEAD request opens a pooled connection so the TCP and TLS handshake is
+    # paid before the scheduled check, not inside it. Hosts that still have an
+    # idle keep-alive connection are skipped: the HEAD would only cost the
+    # provider another request against its rate limit.
+    for url in _request_urls(monitor, config):
+        if _has_idle_connection(http_client, url):
+            continue
         try:
-            result: MonitorResult = await monitor.check(
-                http_client=http_client, logger=module_logger
-            )
-            duration_ms = result.duration_ms
-            if duration_ms is None:
-                duration_ms = (time.perf_counter() - started) * 1000
-
-            log_level = logging.INFO
-            if result.status == MonitorStatus.ALERT:
-                log_level = logging.WARNING
-            elif result.status == MonitorStatus.ERROR:
-                log_level = logging.ERROR
-
-            module_logger.log(
-                log_level,
-                result.message,
-                extra={
-                    "event": "monitor_check",
-                    "module_id": config.slug,
-                    "status": result.status.value,
-                    "reason": result.reason,
-                    "duration_ms": round(duration_ms, 2),
-                    "interval_seconds": config.interval_seconds,
-                },
-            )
-
-            level_name = logging.getLevelName(log_level)
-            if notifier is not None:
-                try:
-                    await notifier.handle_result(
-                        module_id=config.slug,
-                        result=result,
-                        module_config=config,
-                        level_name=level_name,
-                        event_name="monitor_check",
-                        event_time=datetime.now(timezone.utc),
-                        http_client=http_client,
-                        logger=module_logger,
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    module_logger.error(
-                        "notification dispatch failed",
-                        extra={
-                            "event": "notify_error",
-                            "module_id": config.slug,
-                            "status": MonitorStatus.ERROR.value,
-                            "reason": str(exc),
-                            "interval_seconds": config.interval_seconds,
-                        },
-                    )
-        except asyncio.CancelledError:
-            raise
+            async with limiter.slot(url):
+                await http_client.head(url, timeout=config.timeout_seconds)
         except Exception as exc:  # noqa: BLE001
-            duration_ms = (time.perf_counter() - started) * 1000
-            module_logger.error(
-                "monitor loop error",
+            logger.getChild(config.slug).debug(
+                "connection prewarm failed",
                 extra={
-                    "event": "monitor_check",
+                    "event": "prewarm",
                     "module_id": config.slug,
-                    "status": MonitorStatus.ERROR.value,
                     "reason": str(exc),
-                    "duration_ms": round(duration_ms, 2),
-                    "interval_seconds": config.interval_seconds,
                 },
             )
 
-        await asyncio.sleep(max(config.interval_seconds, 1))
+
+def _startup_offset(config: ModuleConfig, jitter_seconds: float) -> float:
+    # Deterministic per module: the same slug always lands on the same offset.
+    window = min(max(jitter_seconds, 0.0), float(max(config.interval_seconds, 1)))
+    if window <= 0:
+        return 0.0
+    return (zlib.crc32(config.slug.encode("utf-8")) / 2**32) * window
+
+
+def _next_due(due: float, now: float, config: ModuleConfig) -> float:
+    interval = max(config.interval_seconds, 1)
+    next_due = due + interval
+    if next_due <= now:
+        # Missed ticks are dropped so a slow check does not cause a burst.
+        missed = int((now - due) // interval)
+        next_due = due + (missed + 1) * interval
+    return next_due
+
+
+async def _run_check(
+    monitor: object,
+    config: ModuleConfig,
+    http_client: httpx.AsyncClient,
+    logger: logging.Logger,
+    notifier: NotificationManager | None,
+    limiter: RequestLimiter,
+    lag_ms: float,
+) -> None:
+    module_logger = logger.getChild(config.slug)
+    started = time.perf_counter()
+    # Slots are taken per request inside the check; the time spent waiting
+    # for them is reported as queue_ms and taken out of duration_ms.
+    slots = limiter.track()
+    try:
+        result: MonitorResult = await monitor.check(
+            http_client=http_client, logger=module_logger, limiter=slots
+        )
+        duration_ms = result.duration_ms
+        if duration_ms is None:
+            duration_ms = (time.perf_counter() - started) * 1000
+        duration_ms = max(duration_ms - slots.queue_ms, 0.0)
+        result = replace(result, duration_ms=round(duration_ms, 2))
+
+        log_level = logging.INFO
+        if result.status == MonitorStatus.ALERT:
+            log_level = logging.WARNING
+        elif result.status == MonitorStatus.ERROR:
+            log_level = logging.ERROR
+
+        module_logger.log(
+            log_level,
+            result.message,
+            extra={
+                "event": "monitor_check",
+                "module_id": config.slug,
+                "status": result.status.value,
+                "reason": result.reason,
+                "duration_ms": round(duration_ms, 2),
+                "lag_ms": round(lag_ms, 2),
+                "queue_ms": round(slots.queue_ms, 2),
+                "interval_seconds": config.interval_seconds,
+                "changes": _change_counts(result),
+                **_cache_stats(monitor),
+            },
+        )
+
+        level_name = logging.getLevelName(log_level)
+        if notifier is not None:
+            try:
+                await notifier.handle_result(
+                    module_id=config.slug,
+                    result=result,
+                    module_config=config,
+                    level_name=level_name,
+                    event_name="monitor_check",
+                    event_time=datetime.now(timezone.utc),
+                    http_client=http_client,
+                    logger=module_logger,
+                )
+            except Exception as exc:  # noqa: BLE001
+                module_logger.error(
+                    "notification dispatch failed",
+                    extra={
+                        "event": "notify_error",
+                        "module_id": config.slug,
+                        "status": MonitorStatus.ERROR.value,
+                        "reason": str(exc),
+                        "interval_seconds": config.interval_seconds,
+                    },
+                )
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        duration_ms = max((time.perf_counter() - started) * 1000 - slots.queue_ms, 0.0)
+        module_logger.error(
+            "monitor loop error",
+            extra={
+                "event": "monitor_check",
+                "module_id": config.slug,
+                "status": MonitorStatus.ERROR.value,
+                "reason": str(exc),
+                "duration_ms": round(duration_ms, 2),
+                "lag_ms": round(lag_ms, 2),
+                "queue_ms": round(slots.queue_ms, 2),
+                "interval_seconds": config.interval_seconds,
+            },
+        )
+
+
+def _cache_stats(monitor: object) -> Dict[str, int]:
+    stats = getattr(monitor, "cache_stats", None)
+    if not callable(stats):
+        return {}
+    return stats()
+
+
+def _request_urls(monitor: object, config: ModuleConfig) -> List[str]:
+    urls = getattr(monitor, "request_urls", None)
+    if not callable(urls):
+        return config.urls or [config.url]
+    return urls()
+
+
+def _has_idle_connection(http_client: httpx.AsyncClient, url: str) -> bool:
+    # httpx has no public view of its pool; if the internals are not what we
+    # expect (custom or mock transport), report no connection and warm anyway.
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    try:
+        origin = httpcore.URL(url).origin
+        return any(
+            connection.can_handle_request(origin)
+            and connection.is_idle()
+            and not connection.has_expired()
+            for connection in pool.connections
+        )
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _change_counts(result: MonitorResult) -> Optional[Dict[str, int]]:
+    if result.changes is None:
+        return None
+    return {kind: len(ids) for kind, ids in result.changes.items()}
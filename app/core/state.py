@@ -0,0 +1,408 @@
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from .config import AlertStateConfig
+from .types import MonitorStatus
+
+_SWEEP_SECONDS = 60.0
+_NEVER = math.nan
+# Status codes stored in the table; 0 marks a free slot.
+_STATUSES = (None, MonitorStatus.OK, MonitorStatus.ALERT, MonitorStatus.ERROR)
+_CODES = {status: code for code, status in enumerate(_STATUSES) if status is not None}
+_ALERT = _CODES[MonitorStatus.ALERT]
+
+
+@dataclass
+class AlertState:
+    last_status: MonitorStatus
+    last_alert_at: Optional[datetime]
+
+
+class AlertStateStore:
+    """Alert lifecycle per module/service key, kept in memory only.
+
+    The table is column-oriented: each key maps to a slot index, and the
+    status code, last alert time and last-seen time of a slot live in a
+    `bytearray` and two `array('d')` columns (NaN for "never alerted"),
+    so an entry costs its key plus a few bytes instead of a dataclass and
+    a datetime. Freed slots are reused.
+
+    Entries that are not in `ALERT` and have not been seen for
+    `ttl_seconds` are evicted (an alerting entry must stay until its
+    recovery is sent). When the table grows past `max_entries`, the least
+    recently seen entries go first, non-alerting ones before alerting
+    ones, until it is back to 90% of the cap. Zero disables either bound.
+    """
+
+    def __init__(self, ttl_seconds: float = 0.0, max_entries: int = 0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evicted = 0
+        self._clear()
+        self._sweep_interval = min(ttl_seconds, _SWEEP_SECONDS) if ttl_seconds > 0 else 0.0
+        self._next_sweep = time.time() + self._sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str) -> Optional[AlertState]:
+        slot = self._index.get(key)
+        if slot is None:
+            return None
+        alert_at = self._alert_at[slot]
+        return AlertState(
+            last_status=_STATUSES[self._status[slot]],
+            last_alert_at=(
+                None
+                if math.isnan(alert_at)
+                else datetime.fromtimestamp(alert_at, tz=timezone.utc)
+            ),
+        )
+
+    def set(self, key: str, state: AlertState) -> None:
+        now = time.time()
+        code = _CODES[state.last_status]
+        alert_at = state.last_alert_at.timestamp() if state.last_alert_at else _NEVER
+        slot = self._index.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+        elif self._status[slot] == code and _same_time(self._alert_at[slot], alert_at):
+            self._seen_at[slot] = now
+            if self._sweep_interval and now >= self._next_sweep:
+                self.evict(now)
+            return
+
+        self._status[slot] = code
+        self._alert_at[slot] = alert_at
+        self._seen_at[slot] = now
+        self._record(key, slot)
+        if self.max_entries and len(self._index) > self.max_entries:
+            self.evict(now)
+        elif self._sweep_interval and now >= self._next_sweep:
+            self.evict(now)
+
+    def alerting(self, prefix: str = "") -> List[str]:
+        """Keys starting with `prefix` whose last status is `ALERT`."""
+        return [
+            key
+            for key, slot in self._index.items()
+            if key.startswith(prefix) and self._status[slot] == _ALERT
+        ]
+
+    def evict(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        self._next_sweep = now + self._sweep_interval
+        status, seen_at = self._status, self._seen_at
+        victims: List[str] = []
+        if self.ttl_seconds > 0:
+            cutoff = now - self.ttl_seconds
+            victims = [
+                key
+                for key, slot in self._index.items()
+                if status[slot] != _ALERT and seen_at[slot] < cutoff
+            ]
+        remaining = len(self._index) - len(victims)
+        if self.max_entries and remaining > self.max_entries:
+            expired = set(victims)
+            victims.extend(
+                key
+                for key, _ in heapq.nsmallest(
+                    remaining - int(self.max_entries * 0.9),
+                    (item for item in self._index.items() if item[0] not in expired),
+                    key=lambda item: (status[item[1]] == _ALERT, seen_at[item[1]]),
+                )
+            )
+        for key in victims:
+            slot = self._index.pop(key)
+            status[slot] = 0
+            self._free.append(slot)
+            self._record(key, None)
+        self.evicted += len(victims)
+        return len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        """Entry counts and an estimate of the table's memory footprint."""
+        memory = (
+            sys.getsizeof(self._index)
+            + sys.getsizeof(self._status)
+            + sys.getsizeof(self._alert_at)
+            + sys.getsizeof(self._seen_at)
+            + sys.getsizeof(self._free)
+        )
+        for key, slot in self._index.items():
+            memory += sys.getsizeof(key) + sys.getsizeof(slot)
+        return {
+            "entries": len(self._index),
+            "alerting": sum(1 for slot in self._index.values() if self._status[slot] == _ALERT),
+            "evicted": self.evicted,
+            "memory_bytes": memory,
+        }
+
+    def load(self, logger: logging.Logger) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _clear(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._status = bytearray()
+        self._alert_at = array("d")
+        self._seen_at = array("d")
+        self._free: List[int] = []
+
+    def _allocate(self, key: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._status)
+            self._status.append(0)
+            self._alert_at.append(_NEVER)
+            self._seen_at.append(0.0)
+        self._index[key] = slot
+        return slot
+
+    def _put(self, key: str, code: int, alert_at: float, seen_at: float) -> None:
+        slot = self._index.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+        self._status[slot] = code
+        self._alert_at[slot] = alert_at
+        self._seen_at[slot] = seen_at
+
+    def _drop(self, key: str) -> None:
+        slot = self._index.pop(key, None)
+        if slot is not None:
+            self._status[slot] = 0
+            self._free.append(slot)
+
+    def _record(self, key: str, slot: Optional[int]) -> None:
+        """Hook called for every change; `slot` is None for an eviction."""
+
+
+class FileAlertStateStore(AlertStateStore):
+    """Snapshot file plus an append-only journal of changes.
+
+    Only transitions and evictions are journaled (re-writing an unchanged
+    state just refreshes its last-seen time), so steady-state checks write
+    nothing. Once the journal holds more records than `compact_records` and
+    than there are live keys, it is moved aside to `<path>.journal.old`, a
+    new journal is started, and the current entries are written to a new
+    snapshot in a worker thread, so checks keep running meanwhile. Records
+    hold absolute values, so replaying the old journal on top of a newer
+    snapshot after a crash mid-compaction is harmless; a torn last line is
+    skipped.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compact_records: int = 1000,
+        ttl_seconds: float = 0.0,
+        max_entries: int = 0,
+    ) -> None:
+        super().__init__(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self.snapshot_path = path
+        self.journal_path = f"{path}.journal"
+        self.rotated_path = f"{path}.journal.old"
+        self.compact_records = compact_records
+        self._journal: Optional[TextIO] = None
+        self._journal_records = 0
+        self._compaction: Optional[asyncio.Task] = None
+        self._logger: Optional[logging.Logger] = None
+
+    def load(self, logger: logging.Logger) -> None:
+        self._logger = logger
+        start = time.perf_counter()
+        now = time.time()
+        snapshot = {}
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as handle:
+                snapshot = json.load(handle)
+            for key, value in snapshot.items():
+                self._put(key, *_decode(value, now))
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.error(
+                "alert state snapshot unreadable; ignoring it",
+                extra={"event": "state_load", "reason": str(exc)},
+            )
+            self._clear()
+
+        # A journal left aside by an interrupted compaction is older than
+        # the current one.
+        replayed, _ = self._replay(self.rotated_path, now)
+        current, torn = self._replay(self.journal_path, now)
+        replayed += current
+
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if torn:
+            # Keep the next record off the partial line a crash left behind.
+            self._journal.write("\n")
+        self._journal_records = current
+        logger.info(
+            "alert state loaded",
+            extra={
+                "event": "state_load",
+                "reason": f"{len(snapshot)} snapshot entries, {replayed} journal records",
+                "entries": len(self._index),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            },
+        )
+        self.evict(now)
+        self._maybe_compact()
+
+    async def close(self) -> None:
+        if self._journal is None:
+            return
+        if self._compaction is not None:
+            await asyncio.gather(self._compaction, return_exceptions=True)
+        await self.compact()
+        self._journal.close()
+        self._journal = None
+
+    async def compact(self) -> None:
+        # The columns are copied and the journal rotated synchronously, so
+        # records made while the snapshot is written land in the new
+        # journal; encoding, serialization and fsync run in a thread.
+        columns = (
+            dict(self._index),
+            bytes(self._status),
+            array("d", self._alert_at),
+            array("d", self._seen_at),
+        )
+        self._rotate()
+        await asyncio.to_thread(self._write_snapshot, *columns)
+        os.remove(self.rotated_path)
+
+    def _rotate(self) -> None:
+        self._journal.close()
+        if os.path.exists(self.rotated_path):
+            # A failed compaction left an older journal aside; keep both.
+            with open(self.rotated_path, "a+", encoding="utf-8") as rotated:
+                rotated.seek(0, os.SEEK_END)
+                if rotated.tell():
+                    rotated.seek(rotated.tell() - 1)
+                    if rotated.read(1) != "\n":
+                        rotated.write("\n")
+                with open(self.journal_path, encoding="utf-8") as journal:
+                    shutil.copyfileobj(journal, rotated)
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal_records = 0
+
+    def _write_snapshot(
+        self, index: Dict[str, int], status: bytes, alert_at: array, seen_at: array
+    ) -> None:
+        snapshot = {
+            key: _encode(status, alert_at, seen_at, slot) for key, slot in index.items()
+        }
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.snapshot_path)
+
+    async def _compact_in_background(self) -> None:
+        try:
+            await self.compact()
+        except Exception as exc:  # noqa: BLE001
+            # The old journal stays aside and is folded into the next attempt.
+            if self._logger is not None:
+                self._logger.error(
+                    "alert state compaction failed",
+                    extra={"event": "state_compact", "reason": str(exc)},
+                )
+        finally:
+            self._compaction = None
+
+    def _replay(self, path: str, now: float) -> Tuple[int, bool]:
+        replayed = 0
+        torn = False
+        try:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    torn = not line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                        key = record.pop("k")
+                        if record.get("d"):
+                            self._drop(key)
+                        else:
+                            self._put(key, *_decode(record, now))
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+        return replayed, torn
+
+    def _record(self, key: str, slot: Optional[int]) -> None:
+        if self._journal is None:
+            return
+        if slot is None:
+            record = {"k": key, "d": 1}
+        else:
+            record = {"k": key, **_encode(self._status, self._alert_at, self._seen_at, slot)}
+        self._journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._journal.flush()
+        self._journal_records += 1
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if self._compaction is not None:
+            return
+        if self._journal_records > max(self.compact_records, len(self._index)):
+            self._compaction = asyncio.get_running_loop().create_task(
+                self._compact_in_background(), name="alert-state-compaction"
+            )
+
+
+def create_state_store(config: AlertStateConfig) -> AlertStateStore:
+    if config.backend == "file":
+        return FileAlertStateStore(
+            config.path,
+            compact_records=config.compact_records,
+            ttl_seconds=config.ttl_seconds,
+            max_entries=config.max_entries,
+        )
+    return AlertStateStore(ttl_seconds=config.ttl_seconds, max_entries=config.max_entries)
+
+
+def _same_time(left: float, right: float) -> bool:
+    # NaN ("never alerted") never compares equal to itself.
+    return left == right or (math.isnan(left) and math.isnan(right))
+
+
+def _encode(status: bytes, alert_at: array, seen_at: array, slot: int) -> dict:
+    record = {"s": _STATUSES[status[slot]].value, "a": round(seen_at[slot], 3)}
+    if not math.isnan(alert_at[slot]):
+        record["t"] = alert_at[slot]
+    return record
+
+
+def _decode(record: dict, now: float) -> Tuple[int, float, float]:
+    alert_at = record.get("t")
+    return (
+        _CODES[MonitorStatus(record["s"])],
+        float(alert_at) if alert_at is not None else _NEVER,
+        float(record.get("a", now)),
+    )
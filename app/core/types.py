@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 
 class MonitorStatus(str, Enum):
@@ -16,4 +17,24 @@ class MonitorResult:
     reason: Optional[str] = None
     duration_ms: Optional[float] = None
     payload: Optional[Any] = None
+    changes: Optional[Dict[str, List[str]]] = None
 
+
+@dataclass
+class DeliveryOutcome:
+    target: str
+    ok: bool
+    reason: Optional[str] = None
+    duration_ms: Optional[float] = None
+    # Accepted for later delivery (a webhook batch), not sent yet.
+    queued: bool = False
+
+
+@dataclass
+class DigestEntry:
+    module_id: str
+    result: MonitorResult
+    interval_seconds: int
+    level_name: str
+    event_name: str
+    event_time: datetime
@@ -39,8 +39,16 @@ async def run_monitor_service() -> None:
     async with create_http_client(
         timeout_seconds=config.defaults.timeout_seconds,
         user_agent=config.defaults.user_agent,
+        http_config=config.http,
+        logger=logger,
     ) as http_client:
-        await schedule_monitors(monitors, http_client, logger, notifier)
+        await notifier.start(http_client, logger)
+        try:
+            await schedule_monitors(
+                monitors, http_client, logger, notifier, config.scheduler
+            )
+        finally:
+            await notifier.stop()
 
 
 def main() -> None:
@@ -1,4 +1,4 @@
-import json
+import codecs
 import logging
 import re
 import time
@@ -7,32 +7,70 @@ from typing import Dict, List, Optional
 import httpx
 
 from ...core.config import ModuleConfig
+from ...core.fetch import ConditionalFetcher, RequestLimiter, replay_result
+from ...core.filters import ServiceFilter
+from ...core.rules import CompiledRule, compile_rule
 from ...core.types import MonitorResult, MonitorStatus
 
+_DEFAULT_TYPE_CODES = ["operational_issue"]
+_STATUS_CODE_PATTERN = re.compile(
+    r"(operational_issue|availability|performance|degradation)", re.IGNORECASE
+)
+
 
 class AwsStatusMonitor:
     def __init__(self, slug: str = "aws") -> None:
         self.id = slug
         self.config: Optional[ModuleConfig] = None
+        self._fetcher = ConditionalFetcher()
+        self._rule: Optional[CompiledRule] = None
+        self._regions = ServiceFilter([])
+        self._type_codes = ServiceFilter(_DEFAULT_TYPE_CODES, substring_default=True)
 
     def configure(self, config: ModuleConfig) -> None:
         self.config = config
+        self._rule = compile_rule(config.rule)
+        self._regions = ServiceFilter(config.service_filter)
+        # typeCode tokens match anywhere in the code (`operational_issue`
+        # matches `AWS_EC2_OPERATIONAL_ISSUE`).
+        code_tokens = [item for item in (config.rule.value or "").split(",") if item.strip()]
+        self._type_codes = ServiceFilter(
+            code_tokens or _DEFAULT_TYPE_CODES, substring_default=True
+        )
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._fetcher.stats()
+
+    def request_urls(self) -> List[str]:
+        return [self.config.url] if self.config else []
 
     async def check(
-        self, http_client: httpx.AsyncClient, logger: logging.Logger
+        self,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+        limiter: Optional[RequestLimiter] = None,
     ) -> MonitorResult:
         if self.config is None:
             raise RuntimeError("aws monitor not configured")
 
         start = time.perf_counter()
         try:
-            response = await http_client.get(
+            fetched = await self._fetcher.get(
+                http_client,
                 self.config.url,
                 timeout=self.config.timeout_seconds,
                 headers={"User-Agent": self.config.user_agent},
+                limiter=limiter,
             )
+            if fetched.unchanged:
+                duration_ms = (time.perf_counter() - start) * 1000
+                return replay_result(fetched.entry, duration_ms)
+            response = fetched.response
             response.raise_for_status()
-            data = response.json()
+            if self._rule.is_text:
+                data = _utf8_body(response.content)
+            else:
+                data = response.json()
         except Exception as exc:  # noqa: BLE001
             duration_ms = (time.perf_counter() - start) * 1000
             return MonitorResult(
@@ -43,6 +81,11 @@ class AwsStatusMonitor:
             )
 
         duration_ms = (time.perf_counter() - start) * 1000
+        result = self._build_result(data, duration_ms)
+        self._fetcher.store(self.config.url, fetched, result)
+        return result
+
+    def _build_result(self, data: object, duration_ms: float) -> MonitorResult:
         rule_status, rule_reason, payload = self._evaluate_rule(data)
 
         if rule_status == MonitorStatus.ERROR:
@@ -74,34 +117,28 @@ class AwsStatusMonitor:
         if self.config is None:
             return MonitorStatus.ERROR, "missing config", None
 
+        if self._rule.is_text or self._rule.is_expr:
+            rule_status, rule_reason = self._rule.evaluate(data)
+            return rule_status, rule_reason, None
+
         if not isinstance(data, list):
             return MonitorStatus.ERROR, "unexpected incidents payload", None
 
-        targets = {item.strip().lower() for item in (self.config.service_filter or []) if item.strip()}
-        code_tokens = {item.strip().lower() for item in (self.config.rule.value or "").split(",") if item.strip()}
-        if not code_tokens:
-            code_tokens = {"operational_issue"}
-
         active_events = []
         for event in data:
             if not isinstance(event, dict):
                 continue
-            region = (event.get("region") or "").lower()
-            if targets and region not in targets:
+            if not self._regions.matches(event.get("region")):
                 continue
 
             end_time = event.get("endTime")
             if end_time:
                 continue
 
-            type_code = (event.get("typeCode") or "").lower()
-            status_code = _extract_status_code(event)
-
-            if not type_code:
-                continue
-
-            if not any(token in type_code for token in code_tokens):
+            type_code = event.get("typeCode") or ""
+            if not type_code or not self._type_codes.matches(type_code):
                 continue
+            status_code = _extract_status_code(event)
 
             active_events.append(
                 {
@@ -128,11 +165,18 @@ def _extract_status_code(event: Dict) -> str:
     if status is not None:
         return str(status)
     type_code = event.get("typeCode") or ""
-    match = re.search(r"(operational_issue|availability|performance|degradation)", type_code, re.IGNORECASE)
+    match = _STATUS_CODE_PATTERN.search(type_code)
     if match:
         return match.group(1).lower()
     return "unknown"
 
 
+def _utf8_body(content: bytes) -> bytes:
+    # The dashboard has served UTF-16 with a BOM; text rules search UTF-8 bytes.
+    if content.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return content.decode("utf-16").encode("utf-8")
+    return content
+
+
 def get_monitor(slug: str = "aws") -> AwsStatusMonitor:
     return AwsStatusMonitor(slug=slug)
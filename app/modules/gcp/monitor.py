@@ -1,38 +1,86 @@
+import codecs
 import json
 import logging
-import re
 import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 import httpx
 
 from ...core.config import ModuleConfig
+from ...core.fetch import ConditionalFetcher, RequestLimiter, replay_result
+from ...core.filters import ServiceFilter
+from ...core.rules import CompiledRule, compile_rule
 from ...core.types import MonitorResult, MonitorStatus
 
+_STREAM_CHUNK_BYTES = 64 * 1024
+_DEFAULT_STATUSES = {"service_disruption", "service_outage", "service_information"}
+
+
+@dataclass
+class IndexedIncident:
+    modified: Optional[str]
+    # None when the incident is active but does not match the rule/filter.
+    entry: Optional[Dict]
+
 
 class GcpStatusMonitor:
     def __init__(self, slug: str = "gcp") -> None:
         self.id = slug
         self.config: Optional[ModuleConfig] = None
+        self._fetcher = ConditionalFetcher()
+        self._changes: Optional[Dict[str, List[str]]] = None
+        self._index: Dict[str, IndexedIncident] = {}
+        self._statuses: set[str] = set(_DEFAULT_STATUSES)
+        self._filter = ServiceFilter([])
+        self._rule: Optional[CompiledRule] = None
 
     def configure(self, config: ModuleConfig) -> None:
         self.config = config
+        statuses = {
+            item.strip().lower() for item in (config.rule.value or "").split(",") if item.strip()
+        }
+        self._statuses = statuses or set(_DEFAULT_STATUSES)
+        self._filter = ServiceFilter(config.service_filter)
+        self._index = {}
+        self._rule = compile_rule(config.rule)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._fetcher.stats()
+
+    def request_urls(self) -> List[str]:
+        return [self.config.url] if self.config else []
 
     async def check(
-        self, http_client: httpx.AsyncClient, logger: logging.Logger
+        self,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+        limiter: Optional[RequestLimiter] = None,
     ) -> MonitorResult:
         if self.config is None:
             raise RuntimeError("gcp monitor not configured")
 
         start = time.perf_counter()
         try:
-            response = await http_client.get(
+            fetched = await self._fetcher.get(
+                http_client,
                 self.config.url,
                 timeout=self.config.timeout_seconds,
                 headers={"User-Agent": self.config.user_agent},
+                limiter=limiter,
             )
+            if fetched.unchanged:
+                duration_ms = (time.perf_counter() - start) * 1000
+                return replay_result(fetched.entry, duration_ms)
+            response = fetched.response
             response.raise_for_status()
-            data = response.json()
+            if self._streaming():
+                data = _iter_incidents(response.iter_bytes(_STREAM_CHUNK_BYTES))
+            elif self._rule.is_text:
+                data = response.content
+            else:
+                data = response.json()
         except Exception as exc:  # noqa: BLE001
             duration_ms = (time.perf_counter() - start) * 1000
             return MonitorResult(
@@ -43,6 +91,15 @@ class GcpStatusMonitor:
             )
 
         duration_ms = (time.perf_counter() - start) * 1000
+        result = self._build_result(data, duration_ms)
+        self._fetcher.store(self.config.url, fetched, result)
+        return result
+
+    def _streaming(self) -> bool:
+        return self.config.rule.kind == "status" and self.config.parse_mode != "full"
+
+    def _build_result(self, data: object, duration_ms: float) -> MonitorResult:
+        self._changes = None
         rule_status, rule_reason, payload = self._evaluate_rule(data)
 
         if rule_status == MonitorStatus.ERROR:
@@ -61,6 +118,7 @@ class GcpStatusMonitor:
                 reason=rule_reason,
                 duration_ms=round(duration_ms, 2),
                 payload=payload,
+                changes=self._changes,
             )
 
         return MonitorResult(
@@ -68,89 +126,75 @@ class GcpStatusMonitor:
             message="gcp status healthy",
             duration_ms=round(duration_ms, 2),
             payload=payload,
+            changes=self._changes,
         )
 
     def _evaluate_rule(self, data: object) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
         if self.config is None:
             return MonitorStatus.ERROR, "missing config", None
 
-        rule_kind = self.config.rule.kind
-        rule_value = self.config.rule.value
+        if self.config.rule.kind == "status":
+            return self._evaluate_status_rule(data)
 
-        if rule_kind == "status":
-            return self._evaluate_status_rule(data, rule_value)
-
-        text_body = json.dumps(data)
-        if not rule_value:
-            return MonitorStatus.OK, None, None
-
-        if rule_kind == "keyword":
-            if rule_value.lower() in text_body.lower():
-                return MonitorStatus.ALERT, f"keyword '{rule_value}' detected", None
-            return MonitorStatus.OK, None, None
-
-        if rule_kind == "regex":
-            try:
-                pattern = re.compile(rule_value, re.IGNORECASE)
-            except re.error as exc:
-                return MonitorStatus.ERROR, f"invalid regex: {exc}", None
-            if pattern.search(text_body) is not None:
-                return MonitorStatus.ALERT, f"regex '{rule_value}' matched", None
-            return MonitorStatus.OK, None, None
-
-        return MonitorStatus.ERROR, f"unsupported rule kind '{rule_kind}'", None
+        rule_status, rule_reason = self._rule.evaluate(data)
+        return rule_status, rule_reason, None
 
     def _evaluate_status_rule(
-        self, data: object, rule_value: str
+        self, data: object
     ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
-        if not isinstance(data, list):
+        if not isinstance(data, (list, Iterator)):
             return MonitorStatus.ERROR, "unexpected incidents payload", None
 
-        statuses = {item.strip().lower() for item in (rule_value or "").split(",") if item.strip()}
-        if not statuses:
-            statuses = {"service_disruption", "service_outage", "service_information"}
+        try:
+            return self._evaluate_incidents(data)
+        except ValueError as exc:
+            return MonitorStatus.ERROR, f"failed to parse incidents: {exc}", None
 
-        targets = {item.strip().lower() for item in self.config.service_filter}
-        active_incidents = []
+    def _evaluate_incidents(
+        self, data: Iterable
+    ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
+        # Incidents whose modified timestamp did not change reuse the entry
+        # derived on a previous poll instead of re-matching every location.
+        # The index is swapped in only after the whole feed was read.
+        previous = self._index
+        index: Dict[str, IndexedIncident] = {}
+        added: List[str] = []
+        updated: List[str] = []
         for incident in data:
             if not isinstance(incident, dict):
                 continue
 
-            status_impact = (incident.get("status_impact") or "").lower()
-            end_time = incident.get("end")
-            locations = (
-                incident.get("currently_affected_locations")
-                or incident.get("affected_locations")
-                or []
-            )
-
-            if not locations:
-                continue
-
             # Only consider incidents that are not ended yet.
-            if end_time:
-                continue
-
-            if status_impact and status_impact not in statuses:
-                continue
-
-            matched_locations = [
-                loc
-                for loc in locations
-                if _matches_location(loc, targets)
-            ]
-            if not matched_locations:
+            if incident.get("end"):
                 continue
 
-            active_incidents.append(
-                {
-                    "id": incident.get("id"),
-                    "status": status_impact or incident.get("most_recent_update", {}).get("status", ""),
-                    "regions": [loc.get("id") or loc.get("title") for loc in matched_locations],
-                    "most_recent_update": incident.get("most_recent_update"),
-                }
-            )
-
+            incident_id = str(incident.get("id") or "")
+            modified = _incident_modified(incident)
+            cached = previous.get(incident_id) if incident_id else None
+            if cached is not None and modified and cached.modified == modified:
+                entry = cached.entry
+            else:
+                entry = self._derive_entry(incident)
+                if entry is not None:
+                    if cached is None or cached.entry is None:
+                        added.append(incident_id)
+                    else:
+                        updated.append(incident_id)
+            if incident_id:
+                index[incident_id] = IndexedIncident(modified=modified, entry=entry)
+            elif entry is not None:
+                index[f"anonymous-{len(index)}"] = IndexedIncident(modified=None, entry=entry)
+
+        resolved = [
+            incident_id
+            for incident_id, cached in previous.items()
+            if cached.entry is not None
+            and (incident_id not in index or index[incident_id].entry is None)
+        ]
+        self._index = index
+        self._changes = {"added": added, "updated": updated, "resolved": resolved}
+
+        active_incidents = [item.entry for item in index.values() if item.entry is not None]
         if active_incidents:
             reason = "; ".join(
                 f"{inc['regions']}: {inc['status'] or 'unknown'}" for inc in active_incidents
@@ -159,13 +203,94 @@ class GcpStatusMonitor:
 
         return MonitorStatus.OK, None, []
 
-
-def _matches_location(location: Dict, targets: set[str]) -> bool:
-    if not targets:
-        return True
-    loc_id = (location.get("id") or "").lower()
-    title = (location.get("title") or "").lower()
-    return any(target in {loc_id, title} for target in targets)
+    def _derive_entry(self, incident: Dict) -> Optional[Dict]:
+        status_impact = (incident.get("status_impact") or "").lower()
+        locations = (
+            incident.get("currently_affected_locations")
+            or incident.get("affected_locations")
+            or []
+        )
+        if not locations:
+            return None
+
+        if status_impact and status_impact not in self._statuses:
+            return None
+
+        matched_locations = [
+            loc
+            for loc in locations
+            if self._filter.matches(loc.get("id"), loc.get("title"))
+        ]
+        if not matched_locations:
+            return None
+
+        return {
+            "id": incident.get("id"),
+            "status": status_impact or incident.get("most_recent_update", {}).get("status", ""),
+            "regions": [loc.get("id") or loc.get("title") for loc in matched_locations],
+            "most_recent_update": incident.get("most_recent_update"),
+        }
+
+
+def _incident_modified(incident: Dict) -> Optional[str]:
+    modified = incident.get("modified")
+    if modified:
+        return str(modified)
+    update = incident.get("most_recent_update") or {}
+    if isinstance(update, dict):
+        value = update.get("modified") or update.get("when")
+        if value:
+            return str(value)
+    return None
+
+
+def _iter_incidents(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    """Yield the incidents of a top-level JSON array one at a time.
+
+    Each element is decoded with the C decoder as soon as its bytes are
+    available and handed to the caller, so the whole history is never held
+    as Python objects at once.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    opened = False
+    for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            pos = _skip_separators(buffer, pos)
+            if pos >= len(buffer):
+                break
+            if not opened:
+                if buffer[pos] != "[":
+                    raise ValueError("expected a JSON array of incidents")
+                opened = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is incomplete; wait for the next chunk.
+                break
+            yield item
+
+    buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+    if not opened:
+        raise ValueError("expected a JSON array of incidents")
+    # Surface the real decode error for a truncated or malformed body.
+    decoder.raw_decode(buffer, _skip_separators(buffer, 0))
+    raise ValueError("unterminated incidents array")
+
+
+def _skip_separators(buffer: str, pos: int) -> int:
+    length = len(buffer)
+    while pos < length and buffer[pos] in " \t\r\n,":
+        pos += 1
+    return pos
 
 
 def get_monitor(slug: str = "gcp") -> GcpStatusMonitor:
@@ -1,38 +1,81 @@
+import hashlib
 import logging
 import re
 import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
 
 import httpx
 
 from ...core.config import ModuleConfig
+from ...core.fetch import ConditionalFetcher, RequestLimiter, replay_result
+from ...core.filters import ServiceFilter
+from ...core.rules import CompiledRule, compile_rule
 from ...core.types import MonitorResult, MonitorStatus
 
+_FEED_CHUNK_BYTES = 16 * 1024
+_DEFAULT_STATUSES = {"investigating", "identified", "monitoring"}
+_STATUS_PATTERN = re.compile(r"<strong>([^<]+)</strong>", re.IGNORECASE)
+
+
+@dataclass
+class FeedItem:
+    digest: bytes
+    incident: Dict
+    haystack: str
+
 
 class OciStatusMonitor:
     def __init__(self, slug: str = "oci") -> None:
         self.id = slug
         self.config: Optional[ModuleConfig] = None
+        self._fetcher = ConditionalFetcher()
+        self._items: Dict[str, FeedItem] = {}
+        self._rule: Optional[CompiledRule] = None
+        self._filter = ServiceFilter([], substring_default=True)
+        self._statuses: set[str] = set(_DEFAULT_STATUSES)
 
     def configure(self, config: ModuleConfig) -> None:
         self.config = config
+        self._rule = compile_rule(config.rule)
+        # Plain OCI filter entries have always matched anywhere in the item.
+        self._filter = ServiceFilter(config.service_filter, substring_default=True)
+        statuses = {
+            item.strip().lower() for item in (config.rule.value or "").split(",") if item.strip()
+        }
+        self._statuses = statuses or set(_DEFAULT_STATUSES)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._fetcher.stats()
+
+    def request_urls(self) -> List[str]:
+        return [self.config.url] if self.config else []
 
     async def check(
-        self, http_client: httpx.AsyncClient, logger: logging.Logger
+        self,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+        limiter: Optional[RequestLimiter] = None,
     ) -> MonitorResult:
         if self.config is None:
             raise RuntimeError("oci monitor not configured")
 
         start = time.perf_counter()
         try:
-            response = await http_client.get(
+            fetched = await self._fetcher.get(
+                http_client,
                 self.config.url,
                 timeout=self.config.timeout_seconds,
                 headers={"User-Agent": self.config.user_agent},
+                limiter=limiter,
             )
+            if fetched.unchanged:
+                duration_ms = (time.perf_counter() - start) * 1000
+                return replay_result(fetched.entry, duration_ms)
+            response = fetched.response
             response.raise_for_status()
-            xml_body = response.text
+            xml_body = response.content
         except Exception as exc:  # noqa: BLE001
             duration_ms = (time.perf_counter() - start) * 1000
             return MonitorResult(
@@ -43,7 +86,11 @@ class OciStatusMonitor:
             )
 
         duration_ms = (time.perf_counter() - start) * 1000
+        result = self._build_result(xml_body, duration_ms)
+        self._fetcher.store(self.config.url, fetched, result)
+        return result
 
+    def _build_result(self, xml_body: bytes, duration_ms: float) -> MonitorResult:
         rule_status, rule_reason, payload = self._evaluate_rule(xml_body)
         if rule_status == MonitorStatus.ERROR:
             return MonitorResult(
@@ -70,52 +117,69 @@ class OciStatusMonitor:
             payload=payload,
         )
 
-    def _evaluate_rule(self, xml_body: str) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
+    def _evaluate_rule(self, xml_body: bytes) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
         if self.config is None:
             return MonitorStatus.ERROR, "missing config", None
 
         try:
-            incidents = _parse_incidents(xml_body)
+            items = self._parse_items(xml_body)
         except Exception as exc:  # noqa: BLE001
             return MonitorStatus.ERROR, f"failed to parse feed: {exc}", None
 
-        filtered_incidents = _filter_incidents(incidents, self.config.service_filter)
+        filtered_incidents = [
+            item.incident for item in items if self._filter.matches(item.haystack)
+        ]
         rule_kind = self.config.rule.kind
         rule_value = self.config.rule.value
 
         if rule_kind == "status":
-            return self._evaluate_status_rule(filtered_incidents, rule_value)
+            return self._evaluate_status_rule(filtered_incidents)
 
         if not rule_value:
             return MonitorStatus.OK, None, filtered_incidents
 
-        if rule_kind == "keyword":
-            if rule_value.lower() in xml_body.lower():
-                return MonitorStatus.ALERT, f"keyword '{rule_value}' detected", None
-            return MonitorStatus.OK, None, filtered_incidents
-
-        if rule_kind == "regex":
-            try:
-                pattern = re.compile(rule_value, re.IGNORECASE)
-            except re.error as exc:
-                return MonitorStatus.ERROR, f"invalid regex: {exc}", None
-            if pattern.search(xml_body) is not None:
-                return MonitorStatus.ALERT, f"regex '{rule_value}' matched", None
-            return MonitorStatus.OK, None, filtered_incidents
-
-        return MonitorStatus.ERROR, f"unsupported rule kind '{rule_kind}'", None
+        document = filtered_incidents if self._rule.is_expr else xml_body
+        rule_status, rule_reason = self._rule.evaluate(document)
+        if rule_status == MonitorStatus.OK:
+            return rule_status, rule_reason, filtered_incidents
+        return rule_status, rule_reason, None
+
+    def _parse_items(self, xml_body: bytes) -> List[FeedItem]:
+        # Items are cached by guid/link; an item whose description hashes the
+        # same as last poll is reused without re-running the extraction.
+        previous = self._items
+        current: Dict[str, FeedItem] = {}
+        items: List[FeedItem] = []
+        for item in _iter_items(xml_body):
+            title_text = (item.findtext("title") or "").strip()
+            description = item.findtext("description") or ""
+            link = (item.findtext("link") or "").strip()
+            key = (item.findtext("guid") or "").strip() or link or title_text
+            digest = hashlib.blake2b(
+                f"{title_text}\0{description}".encode("utf-8"), digest_size=16
+            ).digest()
+
+            cached = previous.get(key)
+            if cached is None or cached.digest != digest:
+                incident = _build_incident(title_text, description, link)
+                cached = FeedItem(
+                    digest=digest,
+                    incident=incident,
+                    haystack=_incident_haystack(incident),
+                )
+            current[key] = cached
+            items.append(cached)
+
+        self._items = current
+        return items
 
     def _evaluate_status_rule(
-        self, incidents: List[Dict], rule_value: str
+        self, incidents: List[Dict]
     ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
-        targets = {item.strip().lower() for item in (rule_value or "").split(",") if item.strip()}
-        if not targets:
-            targets = {"investigating", "identified", "monitoring"}
-
         matches = [
             incident
             for incident in incidents
-            if incident.get("status") and incident["status"].lower() in targets
+            if incident.get("status") and incident["status"].lower() in self._statuses
         ]
 
         if matches:
@@ -128,26 +192,57 @@ class OciStatusMonitor:
         return MonitorStatus.OK, None, incidents
 
 
-def _parse_incidents(xml_body: str) -> List[Dict]:
-    root = ET.fromstring(xml_body)
-    incidents: List[Dict] = []
-
-    for item in root.findall(".//item"):
-        title_text = (item.findtext("title") or "").strip()
-        service, region, reference = _split_title(title_text)
-        description = item.findtext("description") or ""
-        incidents.append(
-            {
-                "title": title_text,
-                "service": service,
-                "region": region,
-                "reference": reference,
-                "status": _extract_status(description),
-                "link": (item.findtext("link") or "").strip(),
-            }
-        )
-
-    return incidents
+def _iter_items(xml_body: bytes) -> Iterator[ET.Element]:
+    """Incrementally parse the RSS body and yield each `<item>` once complete.
+
+    Items are detached from their parent after the caller is done with them,
+    so the tree never holds more than one item at a time.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parents: List[ET.Element] = []
+    for offset in range(0, len(xml_body), _FEED_CHUNK_BYTES):
+        parser.feed(xml_body[offset : offset + _FEED_CHUNK_BYTES])
+        yield from _drain_items(parser, parents)
+    parser.close()
+    yield from _drain_items(parser, parents)
+
+
+def _drain_items(
+    parser: ET.XMLPullParser, parents: List[ET.Element]
+) -> Iterator[ET.Element]:
+    for event, elem in parser.read_events():
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag != "item":
+            continue
+        yield elem
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
+
+
+def _build_incident(title_text: str, description: str, link: str) -> Dict:
+    service, region, reference = _split_title(title_text)
+    return {
+        "title": title_text,
+        "service": service,
+        "region": region,
+        "reference": reference,
+        "status": _extract_status(description),
+        "link": link,
+    }
+
+
+def _incident_haystack(incident: Dict) -> str:
+    return " ".join(
+        [
+            incident.get("title", ""),
+            incident.get("region", ""),
+            incident.get("service", ""),
+        ]
+    ).lower()
 
 
 def _split_title(title_text: str) -> tuple[str, str, str]:
@@ -159,30 +254,11 @@ def _split_title(title_text: str) -> tuple[str, str, str]:
 
 
 def _extract_status(description: str) -> Optional[str]:
-    match = re.search(r"<strong>([^<]+)</strong>", description, re.IGNORECASE)
+    match = _STATUS_PATTERN.search(description)
     if match:
         return match.group(1).strip()
     return None
 
 
-def _filter_incidents(incidents: List[Dict], targets: List[str]) -> List[Dict]:
-    if not targets:
-        return incidents
-
-    target_set = {target.lower() for target in targets}
-    filtered = []
-    for incident in incidents:
-        haystack = " ".join(
-            [
-                incident.get("title", ""),
-                incident.get("region", ""),
-                incident.get("service", ""),
-            ]
-        ).lower()
-        if any(target in haystack for target in target_set):
-            filtered.append(incident)
-    return filtered
-
-
 def get_monitor(slug: str = "oci") -> OciStatusMonitor:
     return OciStatusMonitor(slug=slug)
@@ -0,0 +1 @@
+"""Generic Atlassian Statuspage monitor module."""
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ...core.config import ModuleConfig
+from ...core.fetch import ConditionalFetcher, RequestLimiter, replay_result
+from ...core.filters import ServiceFilter
+from ...core.rules import CompiledRule, compile_rule
+from ...core.types import MonitorResult, MonitorStatus
+
+_DEFAULT_STATUSES = {"degraded_performance", "partial_outage", "major_outage"}
+_SUMMARY_PATH = "/api/v2/summary.json"
+_PAGE_CONCURRENCY = 20
+
+
+@dataclass
+class StatusPage:
+    url: str
+    name: str
+
+
+class StatuspageMonitor:
+    """Atlassian Statuspage engine polling one or many `summary.json` pages."""
+
+    label = "statuspage"
+
+    def __init__(self, slug: str = "statuspage") -> None:
+        self.id = slug
+        self.config: Optional[ModuleConfig] = None
+        self._fetcher = ConditionalFetcher()
+        self._pages: List[StatusPage] = []
+        self._statuses: set[str] = set(_DEFAULT_STATUSES)
+        self._filter = ServiceFilter([])
+        self._rule: Optional[CompiledRule] = None
+
+    def configure(self, config: ModuleConfig) -> None:
+        urls = config.urls or ([config.url] if config.url else [])
+        if not urls:
+            prefix = _slugify(config.slug).replace("-", "_").upper()
+            raise ValueError(f"{prefix}_URLS or {prefix}_URL is required")
+        self.config = config
+        self._pages = [_build_page(url) for url in urls]
+
+        statuses = {
+            item.strip().lower() for item in (config.rule.value or "").split(",") if item.strip()
+        }
+        self._statuses = statuses or set(_DEFAULT_STATUSES)
+        self._filter = ServiceFilter(config.service_filter)
+        self._rule = compile_rule(config.rule)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._fetcher.stats()
+
+    def request_urls(self) -> List[str]:
+        return [page.url for page in self._pages]
+
+    async def check(
+        self,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+        limiter: Optional[RequestLimiter] = None,
+    ) -> MonitorResult:
+        if self.config is None:
+            raise RuntimeError(f"{self.label} monitor not configured")
+
+        if not self._is_multi_page():
+            return await self._check_page(http_client, self._pages[0], limiter)
+
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(_PAGE_CONCURRENCY)
+
+        async def _bounded(page: StatusPage) -> MonitorResult:
+            async with semaphore:
+                return await self._check_page(http_client, page, limiter)
+
+        page_results = await asyncio.gather(*(_bounded(page) for page in self._pages))
+        duration_ms = (time.perf_counter() - start) * 1000
+        return self._merge_results(page_results, duration_ms, logger)
+
+    async def _check_page(
+        self,
+        http_client: httpx.AsyncClient,
+        page: StatusPage,
+        limiter: Optional[RequestLimiter],
+    ) -> MonitorResult:
+        start = time.perf_counter()
+        try:
+            fetched = await self._fetcher.get(
+                http_client,
+                page.url,
+                timeout=self.config.timeout_seconds,
+                headers={"User-Agent": self.config.user_agent},
+                limiter=limiter,
+            )
+            if fetched.unchanged:
+                duration_ms = (time.perf_counter() - start) * 1000
+                return replay_result(fetched.entry, duration_ms)
+            response = fetched.response
+            response.raise_for_status()
+            data = response.content if self._rule.is_text else response.json()
+        except Exception as exc:  # noqa: BLE001
+            duration_ms = (time.perf_counter() - start) * 1000
+            return MonitorResult(
+                status=MonitorStatus.ERROR,
+                message=f"{self.label} status request failed",
+                reason=self._page_reason(page, str(exc)),
+                duration_ms=round(duration_ms, 2),
+            )
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        result = self._build_result(page, data, duration_ms)
+        self._fetcher.store(page.url, fetched, result)
+        return result
+
+    def _build_result(
+        self, page: StatusPage, data: object, duration_ms: float
+    ) -> MonitorResult:
+        rule_status, rule_reason, payload = self._evaluate_rule(page, data)
+        if rule_status == MonitorStatus.ERROR:
+            return MonitorResult(
+                status=MonitorStatus.ERROR,
+                message=f"{self.label} rule evaluation failed",
+                reason=rule_reason,
+                duration_ms=round(duration_ms, 2),
+                payload=payload,
+            )
+
+        if rule_status == MonitorStatus.ALERT:
+            return MonitorResult(
+                status=MonitorStatus.ALERT,
+                message=f"{self.label} status degraded",
+                reason=rule_reason,
+                duration_ms=round(duration_ms, 2),
+                payload=payload,
+            )
+
+        return MonitorResult(
+            status=MonitorStatus.OK,
+            message=f"{self.label} status healthy",
+            duration_ms=round(duration_ms, 2),
+            payload=payload,
+        )
+
+    def _merge_results(
+        self,
+        page_results: List[MonitorResult],
+        duration_ms: float,
+        logger: logging.Logger,
+    ) -> MonitorResult:
+        alerts = [res for res in page_results if res.status == MonitorStatus.ALERT]
+        errors = [res for res in page_results if res.status == MonitorStatus.ERROR]
+
+        for res in errors:
+            logger.warning(
+                res.message,
+                extra={
+                    "event": "page_error",
+                    "module_id": self.id,
+                    "status": res.status.value,
+                    "reason": res.reason,
+                },
+            )
+
+        # Components of every page that answered are reported, healthy ones
+        # included, so a page that recovered is resolved even while another
+        # page is still alerting.
+        payload: List[Dict] = []
+        for res in page_results:
+            if res.status != MonitorStatus.ERROR and isinstance(res.payload, list):
+                payload.extend(res.payload)
+
+        if alerts:
+            return MonitorResult(
+                status=MonitorStatus.ALERT,
+                message=f"{self.label} status degraded",
+                reason=", ".join(res.reason for res in alerts if res.reason),
+                duration_ms=round(duration_ms, 2),
+                payload=payload,
+            )
+
+        if len(errors) == len(page_results):
+            return MonitorResult(
+                status=MonitorStatus.ERROR,
+                message=f"{self.label} status request failed",
+                reason=", ".join(res.reason for res in errors if res.reason),
+                duration_ms=round(duration_ms, 2),
+            )
+
+        reason = None
+        if errors:
+            reason = f"{len(errors)} of {len(page_results)} pages failed"
+        return MonitorResult(
+            status=MonitorStatus.OK,
+            message=f"{self.label} status healthy",
+            reason=reason,
+            duration_ms=round(duration_ms, 2),
+            payload=payload,
+        )
+
+    def _evaluate_rule(
+        self, page: StatusPage, data: object
+    ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
+        if self.config is None:
+            return MonitorStatus.ERROR, "missing config", None
+
+        if self.config.rule.kind == "status":
+            return self._evaluate_status_rule(page, data)
+
+        rule_status, rule_reason = self._rule.evaluate(data)
+        if rule_status == MonitorStatus.ALERT:
+            rule_reason = self._page_reason(page, rule_reason)
+        return rule_status, rule_reason, None
+
+    def _evaluate_status_rule(
+        self, page: StatusPage, data: Dict
+    ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
+        components = _extract_components(data)
+        if not components:
+            return (
+                MonitorStatus.ERROR,
+                self._page_reason(page, "no components in status response"),
+                None,
+            )
+
+        filtered = components
+        if self._filter:
+            filtered = [
+                c for c in components if self._filter.matches(c["id"], c["slug"], c["name"])
+            ]
+            if not filtered and not self._is_multi_page():
+                return (
+                    MonitorStatus.ERROR,
+                    "no target components matched filter",
+                    {"components": components, "filter": self.config.service_filter},
+                )
+
+        if self._is_multi_page():
+            filtered = [_qualify_component(page, c) for c in filtered]
+
+        components = [
+            {**c, "alerting": c["status"].lower() in self._statuses} for c in filtered
+        ]
+        matches = [c for c in components if c["alerting"]]
+        if matches:
+            reason = ", ".join(f"{c['name']}: {c['status']}" for c in matches)
+            return MonitorStatus.ALERT, reason, components
+
+        return MonitorStatus.OK, None, components
+
+    def _is_multi_page(self) -> bool:
+        return len(self._pages) > 1
+
+    def _page_reason(self, page: StatusPage, reason: str) -> str:
+        if self._is_multi_page():
+            return f"{page.name}: {reason}"
+        return reason
+
+
+def _build_page(url: str) -> StatusPage:
+    url = url.strip()
+    if not url.endswith(".json"):
+        url = url.rstrip("/") + _SUMMARY_PATH
+    name = urlsplit(url).hostname or url
+    return StatusPage(url=url, name=name)
+
+
+def _qualify_component(page: StatusPage, component: Dict) -> Dict:
+    # Prefix ids with the page host so alert keys stay unique across vendors.
+    return {
+        **component,
+        "id": f"{page.name}:{component['id']}",
+        "name": f"{page.name} / {component['name']}",
+        "page": page.name,
+    }
+
+
+def _extract_components(data: Dict) -> List[Dict]:
+    components = data.get("components") or []
+    cleaned: List[Dict] = []
+    for comp in components:
+        name = comp.get("name") or "unknown"
+        comp_id = comp.get("id") or _slugify(name)
+        status = comp.get("status") or "unknown"
+        cleaned.append(
+            {
+                "id": comp_id,
+                "name": name,
+                "status": status,
+                "slug": _slugify(name),
+            }
+        )
+    return cleaned
+
+
+def _slugify(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+
+def get_monitor(slug: str = "statuspage") -> StatuspageMonitor:
+    return StatuspageMonitor(slug=slug)
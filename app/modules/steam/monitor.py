@@ -1,36 +1,107 @@
+import html
+import json
 import logging
 import re
 import time
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
 import httpx
 
 from ...core.config import ModuleConfig
+from ...core.fetch import ConditionalFetcher, RequestLimiter, replay_result
+from ...core.filters import ServiceFilter
+from ...core.rules import CompiledRule, compile_rule
 from ...core.types import MonitorResult, MonitorStatus
 
+_IGNORED_IDS = {"pageviews"}
+_SEVERITIES = {"good", "minor", "major"}
+_DEFAULT_SEVERITIES = {"major", "minor"}
+_SERVICE_CLASSES = {"service", "sep service"}
+_TAG_PATTERN = re.compile(r"<(/?)(div|span)\b([^>]*)>", re.IGNORECASE)
+_ATTR_PATTERN = re.compile(r"""([a-zA-Z_:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_INNER_TAG_PATTERN = re.compile(r"<[^>]+>")
+# Numeric status codes used by the steamstat.us feed.
+_FEED_SEVERITIES = {0: "good", 1: "good", 2: "minor", 3: "major"}
+
+ServiceParser = Callable[[str], Iterator[Dict]]
+
 
 class SteamMonitor:
     def __init__(self, slug: str = "steam") -> None:
         self.id = slug
         self.config: Optional[ModuleConfig] = None
+        self._fetcher = ConditionalFetcher()
+        self._names: Dict[str, str] = {}
+        self._rule: Optional[CompiledRule] = None
+        self._filter = ServiceFilter([])
+        self._severities: set[str] = set(_DEFAULT_SEVERITIES)
 
     def configure(self, config: ModuleConfig) -> None:
         self.config = config
+        self._rule = compile_rule(config.rule)
+        self._filter = ServiceFilter(config.service_filter)
+        severities = {
+            item.strip().lower() for item in config.rule.value.split(",") if item.strip()
+        }
+        self._severities = severities or set(_DEFAULT_SEVERITIES)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._fetcher.stats()
+
+    def request_urls(self) -> List[str]:
+        if self.config is None:
+            return []
+        return [self.config.feed_url if self._uses_feed() else self.config.url]
 
     async def check(
-        self, http_client: httpx.AsyncClient, logger: logging.Logger
+        self,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+        limiter: Optional[RequestLimiter] = None,
     ) -> MonitorResult:
         if self.config is None:
             raise RuntimeError("steam monitor not configured")
 
+        if self._uses_feed():
+            result = await self._check_source(
+                http_client, self.config.feed_url, self._parse_feed_services, limiter
+            )
+            if result.status != MonitorStatus.ERROR:
+                return result
+            logger.warning(
+                "steam feed unavailable, falling back to html",
+                extra={
+                    "event": "steam_feed_fallback",
+                    "module_id": self.id,
+                    "reason": result.reason,
+                },
+            )
+
+        return await self._check_source(
+            http_client, self.config.url, self._parse_page_services, limiter
+        )
+
+    async def _check_source(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        parser: ServiceParser,
+        limiter: Optional[RequestLimiter],
+    ) -> MonitorResult:
         start = time.perf_counter()
         try:
-            response = await http_client.get(
-                self.config.url,
+            fetched = await self._fetcher.get(
+                http_client,
+                url,
                 timeout=self.config.timeout_seconds,
                 headers={"User-Agent": self.config.user_agent},
+                limiter=limiter,
             )
-            body = response.text
+            if fetched.unchanged:
+                duration_ms = (time.perf_counter() - start) * 1000
+                return replay_result(fetched.entry, duration_ms)
+            response = fetched.response
+            body = response.content
         except Exception as exc:  # noqa: BLE001
             duration_ms = (time.perf_counter() - start) * 1000
             return MonitorResult(
@@ -45,12 +116,34 @@ class SteamMonitor:
         if response.status_code >= 400:
             return MonitorResult(
                 status=MonitorStatus.ERROR,
-            message="steam returned error status",
+                message="steam returned error status",
                 reason=f"status {response.status_code}",
                 duration_ms=round(duration_ms, 2),
             )
 
-        rule_status, rule_reason, payload = self._evaluate_rule(body)
+        result = self._build_result(body, parser, duration_ms)
+        self._fetcher.store(url, fetched, result)
+        return result
+
+    def _uses_feed(self) -> bool:
+        return self.config.parse_mode == "json" and bool(self.config.feed_url)
+
+    def _parse_page_services(self, body: str) -> Iterator[Dict]:
+        # Remember display names so feed records (ids only) read the same.
+        for service in _parse_services(body):
+            self._names[service["id"]] = service["name"]
+            yield service
+
+    def _parse_feed_services(self, body: str) -> Iterator[Dict]:
+        for service in _parse_feed(body):
+            if not service["name"]:
+                service["name"] = self._names.get(service["id"], service["id"])
+            yield service
+
+    def _build_result(
+        self, body: bytes, parser: ServiceParser, duration_ms: float
+    ) -> MonitorResult:
+        rule_status, rule_reason, payload = self._evaluate_rule(body, parser)
         if rule_status == MonitorStatus.ERROR:
             return MonitorResult(
                 status=MonitorStatus.ERROR,
@@ -76,7 +169,9 @@ class SteamMonitor:
             payload=payload,
         )
 
-    def _evaluate_rule(self, body: str) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
+    def _evaluate_rule(
+        self, body: bytes, parser: ServiceParser
+    ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
         if self.config is None:
             return MonitorStatus.ERROR, "missing config", None
 
@@ -86,39 +181,32 @@ class SteamMonitor:
             return MonitorStatus.OK, None, None
 
         if rule_kind == "status":
-            return self._evaluate_status_classes(body, rule_value)
+            return self._evaluate_status_classes(body, parser)
 
-        if rule_kind == "keyword":
-            if rule_value.lower() in body.lower():
-                return MonitorStatus.ALERT, f"keyword '{rule_value}' detected", None
-            return MonitorStatus.OK, None, None
-
-        if rule_kind == "regex":
+        if self._rule.is_expr:
             try:
-                pattern = re.compile(rule_value, re.IGNORECASE)
-            except re.error as exc:
-                return MonitorStatus.ERROR, f"invalid regex: {exc}", None
-            if pattern.search(body) is not None:
-                return MonitorStatus.ALERT, f"regex '{rule_value}' matched", None
-            return MonitorStatus.OK, None, None
+                services = list(parser(body.decode("utf-8", errors="replace")))
+            except ValueError as exc:
+                return MonitorStatus.ERROR, f"invalid status feed: {exc}", None
+            rule_status, rule_reason = self._rule.evaluate(services)
+            return rule_status, rule_reason, None
 
-        return MonitorStatus.ERROR, f"unsupported rule kind '{rule_kind}'", None
+        rule_status, rule_reason = self._rule.evaluate(body)
+        return rule_status, rule_reason, None
 
     def _evaluate_status_classes(
-        self, body: str, rule_value: str
+        self, body: bytes, parser: ServiceParser
     ) -> tuple[MonitorStatus, Optional[str], Optional[object]]:
-        targets = {item.strip().lower() for item in rule_value.split(",") if item.strip()}
-        if not targets:
-            targets = {"major", "minor"}
-
-        services = list(_parse_services(body))
+        try:
+            services = list(parser(body.decode("utf-8", errors="replace")))
+        except ValueError as exc:
+            return MonitorStatus.ERROR, f"invalid status feed: {exc}", None
         if not services:
             return MonitorStatus.ERROR, "no services found on page", None
 
         filtered_services = services
-        if self.config and self.config.service_filter:
-            allow = set(self.config.service_filter)
-            filtered_services = [svc for svc in services if svc["id"].lower() in allow]
+        if self._filter:
+            filtered_services = [svc for svc in services if self._filter.matches(svc["id"])]
             if not filtered_services:
                 return (
                     MonitorStatus.ERROR,
@@ -126,7 +214,7 @@ class SteamMonitor:
                     {"services": services, "filter": self.config.service_filter},
                 )
 
-        matches = [svc for svc in filtered_services if svc.get("severity") in targets]
+        matches = [svc for svc in filtered_services if svc.get("severity") in self._severities]
 
         if matches:
             reason = ", ".join(
@@ -138,36 +226,130 @@ class SteamMonitor:
         return MonitorStatus.OK, None, filtered_services
 
 
-def _parse_services(body: str):
-    service_pattern = re.compile(
-        r'<div class="(?:sep )?service">.*?<span class="name">(.*?)</span>.*?'
-        r'<span class="status ([^"]+)" id="([^"]+)">(.*?)</span>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    tag_pattern = re.compile(r"<[^>]+>")
-    ignored_ids = {"pageviews"}
-
-    for match in service_pattern.finditer(body):
-        raw_name = match.group(1)
-        status_class = match.group(2)
-        status_id = match.group(3).strip().lower()
-        status_text = match.group(4).strip()
-        if status_id in ignored_ids:
+def _parse_services(body: str) -> Iterator[Dict]:
+    # Single forward pass over the div/span tags of the page. Each
+    # `<div class="service">` block holds a `<span class="name">` (possibly
+    # wrapping links or svgs) followed by
+    # `<span class="status <class>" id="<id>">text</span>`; records are yielded
+    # as soon as the status span closes. No backtracking, so parse time stays
+    # linear even when the layout drifts.
+    in_service = False
+    name: Optional[str] = None
+    status: Optional[tuple[str, str]] = None
+    capture_start = -1
+    depth = 0
+
+    for match in _TAG_PATTERN.finditer(body):
+        closing, tag, raw = match.groups()
+        if tag[0] in "dD":
+            if (
+                not closing
+                and "service" in raw
+                and _attributes(raw).get("class") in _SERVICE_CLASSES
+            ):
+                in_service, name, status, depth = True, None, None, 0
+            continue
+        if not in_service:
+            continue
+
+        if depth > 0:
+            depth += -1 if closing else 1
+            if depth > 0:
+                continue
+            inner = _inner_text(body[capture_start : match.start()])
+            if status is None:
+                name = inner
+                continue
+            status_class, raw_id = status
+            in_service, status = False, None
+            status_id = raw_id.strip().lower()
+            if status_id in _IGNORED_IDS:
+                continue
+            class_names = status_class.split()
+            yield {
+                "name": name or "unknown-service",
+                "class": status_class,
+                "id": status_id,
+                "severity": next((c for c in class_names if c in _SEVERITIES), None),
+                "status_text": inner,
+            }
             continue
-        # Remove inner HTML (links, svgs) to keep only visible text.
-        name = tag_pattern.sub("", raw_name).strip()
-        if not name:
-            name = "unknown-service"
-        class_names = status_class.split()
-        severity = next((c for c in class_names if c in {"good", "minor", "major"}), None)
+
+        if closing or "class" not in raw:
+            continue
+        attributes = _attributes(raw)
+        css_class = attributes.get("class") or ""
+        if name is None and css_class == "name":
+            capture_start, depth = match.end(), 1
+        elif name is not None and css_class.startswith("status ") and attributes.get("id"):
+            status = (css_class[len("status ") :], attributes["id"])
+            capture_start, depth = match.end(), 1
+
+
+def _parse_feed(body: str) -> Iterator[Dict]:
+    # The feed lists services either as `[id, code, text]` rows or as objects;
+    # both are mapped onto the record shape produced by `_parse_services`.
+    data = json.loads(body)
+    services = data.get("services") if isinstance(data, dict) else data
+    if isinstance(services, dict):
+        services = [
+            {"id": key, **value} if isinstance(value, dict) else [key, value]
+            for key, value in services.items()
+        ]
+    if not isinstance(services, list):
+        raise ValueError("missing services list")
+
+    for entry in services:
+        if isinstance(entry, dict):
+            raw_id = entry.get("id")
+            raw_status = entry.get("status", entry.get("severity"))
+            text = entry.get("text") or entry.get("title") or ""
+            name = entry.get("name") or ""
+        elif isinstance(entry, (list, tuple)) and len(entry) >= 2:
+            raw_id, raw_status = entry[0], entry[1]
+            text = entry[2] if len(entry) > 2 else ""
+            name = ""
+        else:
+            continue
+        if raw_id is None:
+            continue
+        status_id = str(raw_id).strip().lower()
+        if status_id in _IGNORED_IDS:
+            continue
+        severity = _feed_severity(raw_status)
         yield {
-            "name": name,
-            "class": status_class,
+            "name": str(name),
+            "class": severity or str(raw_status),
             "id": status_id,
             "severity": severity,
-            "status_text": status_text,
+            "status_text": str(text),
         }
 
 
+def _feed_severity(raw_status: object) -> Optional[str]:
+    if isinstance(raw_status, bool):
+        return None
+    if isinstance(raw_status, int):
+        return _FEED_SEVERITIES.get(raw_status, "major")
+    value = str(raw_status).strip().lower()
+    if value.isdigit():
+        return _FEED_SEVERITIES.get(int(value), "major")
+    return value if value in _SEVERITIES else None
+
+
+def _attributes(raw: str) -> Dict[str, str]:
+    return {
+        match.group(1).lower(): (
+            match.group(2) if match.group(2) is not None else match.group(3)
+        )
+        for match in _ATTR_PATTERN.finditer(raw)
+    }
+
+
+def _inner_text(fragment: str) -> str:
+    # Remove inner HTML (links, svgs) to keep only visible text.
+    return html.unescape(_INNER_TAG_PATTERN.sub("", fragment)).strip()
+
+
 def get_monitor(slug: str = "steam") -> SteamMonitor:
     return SteamMonitor(slug=slug)
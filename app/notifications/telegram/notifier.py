@@ -1,12 +1,15 @@
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import httpx
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-from ...core.types import MonitorResult
+from ...core.types import DeliveryOutcome, DigestEntry, MonitorResult
+from .ratelimit import TelegramRateLimiter
 
 _TEMPLATE_ENV = Environment(
     loader=FileSystemLoader(Path(__file__).parent / "templates"),
@@ -17,11 +20,22 @@ _TEMPLATE_ENV = Environment(
 _DEFAULT_TEMPLATE = _TEMPLATE_ENV.get_template("telegram_alert.j2")
 _STEAM_TEMPLATE = _TEMPLATE_ENV.get_template("telegram_steam.j2")
 _RESOLVED_TEMPLATE = _TEMPLATE_ENV.get_template("telegram_resolved.j2")
+_DIGEST_TEMPLATE = _TEMPLATE_ENV.get_template("telegram_digest.j2")
+# Telegram rejects longer messages. Measured on the rendered HTML, which is
+# never shorter than the text Telegram counts.
+_MESSAGE_MAX_CHARS = 4096
+_DIGEST_MAX_ITEMS = 40
 
 
 class TelegramNotifier:
-    def __init__(self, config) -> None:
+    def __init__(self, config, max_concurrency: int = 10) -> None:
         self.config = config
+        self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        self._limiter = TelegramRateLimiter(
+            global_per_second=config.rate_global_per_second,
+            chat_per_second=config.rate_chat_per_second,
+            group_per_minute=config.rate_group_per_minute,
+        )
 
     async def send_alert(
         self,
@@ -33,75 +47,15 @@ class TelegramNotifier:
         event_time: datetime,
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
-    ) -> None:
-        if not self.config.bot_token or not self.config.chat_ids:
-            logger.warning(
-                "telegram notifier missing token or chat_ids; skipping",
-                extra={
-                    "event": "notify_skip",
-                    "module_id": module_id,
-                    "target": "telegram",
-                },
-            )
-            return
-
-        payload = _build_payload(
-            module_id,
-            result,
-            interval_seconds,
-            self.config.timestamp_format,
-            self.config.timestamp_zone,
-            level_name,
-            event_name,
-            event_time,
+        module_type: Optional[str] = None,
+    ) -> List[DeliveryOutcome]:
+        if not self._ready(module_id, logger):
+            return []
+        payload = self._payload(
+            module_id, result, interval_seconds, level_name, event_name, event_time
         )
-        text = _render_payload(module_id, payload, logger)
-        url = f"{self.config.api_url.rstrip('/')}/bot{self.config.bot_token}/sendMessage"
-
-        for chat_id in self.config.chat_ids:
-            try:
-                response = await http_client.post(
-                    url,
-                    json={
-                        "chat_id": chat_id,
-                        "text": text,
-                        "parse_mode": "HTML",
-                        "disable_web_page_preview": True,
-                    },
-                    timeout=10.0,
-                )
-                if response.status_code >= 400:
-                    logger.error(
-                        "telegram notification rejected",
-                        extra={
-                            "event": "notify_error",
-                            "module_id": module_id,
-                            "target": "telegram",
-                            "chat_id": chat_id,
-                            "reason": f"status {response.status_code}: {response.text}",
-                        },
-                    )
-                    continue
-                logger.info(
-                    "telegram notification sent",
-                    extra={
-                        "event": "notify",
-                        "module_id": module_id,
-                        "target": "telegram",
-                        "chat_id": chat_id,
-                    },
-                )
-            except Exception as exc:  # noqa: BLE001
-                logger.error(
-                    "telegram notification failed",
-                    extra={
-                        "event": "notify_error",
-                        "module_id": module_id,
-                        "target": "telegram",
-                        "chat_id": chat_id,
-                        "reason": str(exc),
-                    },
-                )
+        text = _render_payload(module_id, payload, logger, module_type)
+        return await self._broadcast(module_id, text, http_client, logger)
 
     async def send_recovery(
         self,
@@ -113,19 +67,63 @@ class TelegramNotifier:
         event_time: datetime,
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
-    ) -> None:
-        if not self.config.bot_token or not self.config.chat_ids:
-            logger.warning(
-                "telegram notifier missing token or chat_ids; skipping",
-                extra={
-                    "event": "notify_skip",
-                    "module_id": module_id,
-                    "target": "telegram",
-                },
-            )
-            return
+    ) -> List[DeliveryOutcome]:
+        if not self._ready(module_id, logger):
+            return []
+        payload = self._payload(
+            module_id, result, interval_seconds, level_name, event_name, event_time
+        )
+        text = _render_with_template(_RESOLVED_TEMPLATE, payload, logger, module_id)
+        return await self._broadcast(module_id, text, http_client, logger)
+
+    async def send_digest(
+        self,
+        scope: str,
+        alerts: List[DigestEntry],
+        recoveries: List[DigestEntry],
+        window_seconds: float,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> List[DeliveryOutcome]:
+        if not self._ready(scope, logger):
+            return []
+        payload = {
+            "scope": scope,
+            "window_seconds": f"{window_seconds:g}",
+            "timestamp": _format_timestamp(
+                event_time, self.config.timestamp_format, self.config.timestamp_zone
+            ),
+            "alert_count": len(alerts),
+            "recovery_count": len(recoveries),
+            "message": f"{len(alerts)} alerts, {len(recoveries)} resolved",
+        }
+        text = _render_digest(payload, alerts, recoveries, logger, scope)
+        return await self._broadcast(scope, text, http_client, logger)
 
-        payload = _build_payload(
+    def _ready(self, module_id: str, logger: logging.Logger) -> bool:
+        if self.config.bot_token and self.config.chat_ids:
+            return True
+        logger.warning(
+            "telegram notifier missing token or chat_ids; skipping",
+            extra={
+                "event": "notify_skip",
+                "module_id": module_id,
+                "target": "telegram",
+            },
+        )
+        return False
+
+    def _payload(
+        self,
+        module_id: str,
+        result: MonitorResult,
+        interval_seconds: int,
+        level_name: str,
+        event_name: str,
+        event_time: datetime,
+    ) -> dict:
+        return _build_payload(
             module_id,
             result,
             interval_seconds,
@@ -135,53 +133,167 @@ class TelegramNotifier:
             event_name,
             event_time,
         )
-        text = _render_with_template(_RESOLVED_TEMPLATE, payload, logger, module_id)
-        url = f"{self.config.api_url.rstrip('/')}/bot{self.config.bot_token}/sendMessage"
 
-        for chat_id in self.config.chat_ids:
-            try:
-                response = await http_client.post(
-                    url,
-                    json={
-                        "chat_id": chat_id,
-                        "text": text,
-                        "parse_mode": "HTML",
-                        "disable_web_page_preview": True,
-                    },
-                    timeout=10.0,
+    async def _broadcast(
+        self,
+        module_id: str,
+        text: str,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> List[DeliveryOutcome]:
+        # All chats are sent concurrently (bounded by the semaphore), so the
+        # total latency is that of the slowest chat.
+        url = f"{self.config.api_url.rstrip('/')}/bot{self.config.bot_token}/sendMessage"
+        return list(
+            await asyncio.gather(
+                *(
+                    self._send_to_chat(url, chat_id, text, module_id, http_client, logger)
+                    for chat_id in self.config.chat_ids
                 )
-                if response.status_code >= 400:
+            )
+        )
+
+    async def _send_to_chat(
+        self,
+        url: str,
+        chat_id: str,
+        text: str,
+        module_id: str,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> DeliveryOutcome:
+        target = f"telegram:{chat_id}"
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            await self._limiter.acquire(chat_id)
+            async with self._semaphore:
+                try:
+                    response = await http_client.post(
+                        url,
+                        json={
+                            "chat_id": chat_id,
+                            "text": text,
+                            "parse_mode": "HTML",
+                            "disable_web_page_preview": True,
+                        },
+                        timeout=10.0,
+                    )
+                except Exception as exc:  # noqa: BLE001
                     logger.error(
-                        "telegram notification rejected",
+                        "telegram notification failed",
                         extra={
                             "event": "notify_error",
                             "module_id": module_id,
                             "target": "telegram",
                             "chat_id": chat_id,
-                            "reason": f"status {response.status_code}: {response.text}",
+                            "reason": str(exc),
                         },
                     )
-                    continue
-                logger.info(
-                    "telegram notification sent",
-                    extra={
-                        "event": "notify",
-                        "module_id": module_id,
-                        "target": "telegram",
-                        "chat_id": chat_id,
-                    },
-                )
-            except Exception as exc:  # noqa: BLE001
-                logger.error(
-                    "telegram notification failed",
+                    return DeliveryOutcome(target, False, str(exc), _elapsed_ms(start))
+
+            # Flood control: wait as long as Telegram asks, then resend.
+            if response.status_code == 429 and attempt < self.config.max_retries:
+                attempt += 1
+                retry_after = _retry_after(response, attempt)
+                self._limiter.backoff(chat_id, retry_after)
+                logger.warning(
+                    "telegram rate limited; retrying",
                     extra={
-                        "event": "notify_error",
+                        "event": "notify_retry",
                         "module_id": module_id,
                         "target": "telegram",
                         "chat_id": chat_id,
-                        "reason": str(exc),
+                        "reason": f"retry_after {retry_after}s (attempt {attempt})",
                     },
                 )
+                continue
+            break
+
+        duration_ms = _elapsed_ms(start)
+        if response.status_code >= 400:
+            reason = f"status {response.status_code}: {response.text}"
+            logger.error(
+                "telegram notification rejected",
+                extra={
+                    "event": "notify_error",
+                    "module_id": module_id,
+                    "target": "telegram",
+                    "chat_id": chat_id,
+                    "reason": reason,
+                },
+            )
+            return DeliveryOutcome(target, False, reason, duration_ms)
+
+        logger.info(
+            "telegram notification sent",
+            extra={
+                "event": "notify",
+                "module_id": module_id,
+                "target": "telegram",
+                "chat_id": chat_id,
+            },
+        )
+        return DeliveryOutcome(target, True, None, duration_ms)
+
+
+def _retry_after(response: httpx.Response, attempt: int) -> float:
+    # Telegram reports the wait in `parameters.retry_after`; fall back to the
+    # Retry-After header, then to exponential backoff.
+    value = None
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        value = (data.get("parameters") or {}).get("retry_after")
+    if value is None:
+        value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return float(min(2 ** attempt, 60))
+
+
+def _render_digest(
+    payload: dict,
+    alerts: List[DigestEntry],
+    recoveries: List[DigestEntry],
+    logger: logging.Logger,
+    scope: str,
+) -> str:
+    # Lines are dropped, resolutions first, until the message fits; what was
+    # left out is summed up in a "… N more" line per section.
+    shown_alerts = min(len(alerts), _DIGEST_MAX_ITEMS)
+    shown_recoveries = min(len(recoveries), _DIGEST_MAX_ITEMS)
+    while True:
+        payload["alerts"] = _digest_items(alerts, shown_alerts)
+        payload["recoveries"] = _digest_items(recoveries, shown_recoveries)
+        text = _render_with_template(_DIGEST_TEMPLATE, payload, logger, scope)
+        if len(text) <= _MESSAGE_MAX_CHARS or not (shown_alerts or shown_recoveries):
+            return text
+        if shown_recoveries:
+            shown_recoveries -= 1
+        else:
+            shown_alerts -= 1
+
+
+def _digest_items(entries: List[DigestEntry], limit: int) -> List[dict]:
+    items = [
+        {
+            "module_id": entry.module_id,
+            "reason": entry.result.reason or entry.result.message,
+        }
+        for entry in entries[:limit]
+    ]
+    hidden = len(entries) - len(items)
+    if hidden > 0:
+        items.append({"module_id": "…", "reason": f"{hidden} more"})
+    return items
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
 
 
 def _build_payload(
@@ -235,12 +347,18 @@ def _serialize_services(payload) -> List[dict]:
     return services
 
 
-def _select_template(module_id: str):
-    return _STEAM_TEMPLATE if module_id.lower() == "steam" else _DEFAULT_TEMPLATE
+def _select_template(module_type: str):
+    return _STEAM_TEMPLATE if module_type.lower() == "steam" else _DEFAULT_TEMPLATE
 
 
-def _render_payload(module_id: str, payload: dict, logger: logging.Logger) -> str:
-    return _render_with_template(_select_template(module_id), payload, logger, module_id)
+def _render_payload(
+    module_id: str,
+    payload: dict,
+    logger: logging.Logger,
+    module_type: Optional[str] = None,
+) -> str:
+    template = _select_template(module_type or module_id)
+    return _render_with_template(template, payload, logger, module_id)
 
 
 def _render_with_template(
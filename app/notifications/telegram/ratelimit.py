@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in arrival order.
+
+    A rate of zero or less disables the rate limit, but a `pause()` (a 429
+    `retry_after`) is still waited out.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping as needed; returns the seconds waited."""
+        if self.rate <= 0 and time.monotonic() >= self._blocked_until:
+            return 0.0
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                delay = self._blocked_until - now
+                if delay <= 0:
+                    if self.rate <= 0:
+                        return waited
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold every waiter for `seconds` and start refilling from empty."""
+        now = time.monotonic()
+        self._refill(now)
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._tokens = 0.0
+
+    def _refill(self, now: float) -> None:
+        # Tokens do not accumulate while the bucket is paused.
+        start = max(self._updated, self._blocked_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = max(now, self._updated)
+
+
+class TelegramRateLimiter:
+    """Global bucket for the bot plus one bucket per chat.
+
+    Group chats (negative ids) get the slower per-minute group budget. A
+    `429` answer pauses the chat bucket for the `retry_after` Telegram sent.
+    """
+
+    def __init__(
+        self,
+        global_per_second: float,
+        chat_per_second: float,
+        group_per_minute: float,
+    ) -> None:
+        self._global = TokenBucket(global_per_second, capacity=global_per_second)
+        self._chat_per_second = chat_per_second
+        self._group_per_second = group_per_minute / 60.0
+        self._chats: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, chat_id: str) -> float:
+        waited = await self._chat_bucket(chat_id).acquire()
+        return waited + await self._global.acquire()
+
+    def backoff(self, chat_id: str, seconds: float) -> None:
+        self._chat_bucket(chat_id).pause(seconds)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            rate = self._group_per_second if chat_id.startswith("-") else self._chat_per_second
+            bucket = TokenBucket(rate)
+            self._chats[chat_id] = bucket
+        return bucket
@@ -1,14 +1,96 @@
+import asyncio
+import gzip
+import json
 import logging
+import random
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Coroutine, Dict, List, Optional, Set, Tuple
 
 import httpx
 
-from ...core.types import MonitorResult
+from ...core.config import WebhookTargetConfig
+from ...core.filters import ServiceFilter
+from ...core.types import DeliveryOutcome, DigestEntry, MonitorResult
+from .outbox import OutboxEntry, WebhookOutbox
+
+
+_LEASE_SECONDS = 30.0
+_RETRY_BATCH = 20
+_RETRY_POLL_SECONDS = 1.0
+_JSON = "application/json"
+_NDJSON = "application/x-ndjson"
+
+
+class WebhookTarget:
+    """One receiver with its own URL, headers and module/status filters."""
+
+    def __init__(self, config: WebhookTargetConfig) -> None:
+        self.name = config.name
+        self.url = config.url
+        # A single unnamed target keeps the historical `webhook` label.
+        self.label = "webhook" if config.name == "default" else f"webhook:{config.name}"
+        self.headers = dict(config.headers)
+        if config.token:
+            self.headers[config.header_name] = config.token
+        self._modules = ServiceFilter(config.modules)
+        self._statuses = set(config.statuses)
+
+    def accepts(self, module_id: str, status: str) -> bool:
+        if self._statuses and status not in self._statuses:
+            return False
+        return self._modules.matches(module_id)
 
 
 class WebhookNotifier:
+    """Every delivery goes through the outbox: it is sent at once and, when
+    the receiver is down or answers 5xx/429, retried in the background with
+    exponential backoff until accepted or `max_attempts` is reached.
+
+    Targets are sent to concurrently over a connection pool of their own,
+    so a slow receiver never competes with the monitors for connections.
+    """
+
     def __init__(self, config) -> None:
         self.config = config
+        self.targets = [WebhookTarget(target) for target in config.targets if target.url]
+        self._targets_by_name = {target.name: target for target in self.targets}
+        self.outbox = WebhookOutbox(config.outbox_path)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._retry_task: Optional[asyncio.Task] = None
+        self._batches: Dict[str, PendingBatch] = {}
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def start(self, http_client: httpx.AsyncClient, logger: logging.Logger) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                headers={"User-Agent": http_client.headers.get("User-Agent", "")},
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_connections,
+                ),
+            )
+        if self._retry_task is None:
+            self._retry_task = asyncio.create_task(
+                self._retry_loop(logger), name="webhook-outbox"
+            )
+
+    async def stop(self) -> None:
+        batches, self._batches = list(self._batches.values()), {}
+        for batch in batches:
+            batch.timer.cancel()
+        await asyncio.gather(*(self._send_batch(batch) for batch in batches))
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            await asyncio.gather(self._retry_task, return_exceptions=True)
+            self._retry_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.outbox.close()
 
     async def send_alert(
         self,
@@ -20,59 +102,18 @@ class WebhookNotifier:
         event_time: datetime,
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
-    ) -> None:
-        if not self.config.url:
-            logger.warning(
-                "webhook notifier missing URL; skipping",
-                extra={
-                    "event": "notify_skip",
-                    "module_id": module_id,
-                    "target": "webhook",
-                },
-            )
-            return
-
-        headers = {}
-        if self.config.token:
-            headers[self.config.header_name] = self.config.token
-
-        payload = {
-            "timestamp": event_time.isoformat(),
-            "level": level_name,
-            "event": event_name,
-            "module": module_id,
-            "status": "ALERT",
-            "message": result.message,
-            "reason": result.reason,
-            "payload": result.payload,
-            "interval_seconds": interval_seconds,
-        }
-
-        try:
-            await http_client.post(
-                self.config.url,
-                json=payload,
-                headers=headers,
-                timeout=10.0,
-            )
-            logger.info(
-                "webhook notification sent",
-                extra={
-                    "event": "notify",
-                    "module_id": module_id,
-                    "target": "webhook",
-                },
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.error(
-                "webhook notification failed",
-                extra={
-                    "event": "notify_error",
-                    "module_id": module_id,
-                    "target": "webhook",
-                    "reason": str(exc),
-                },
-            )
+    ) -> List[DeliveryOutcome]:
+        return await self._send(
+            "ALERT",
+            module_id,
+            result,
+            interval_seconds,
+            level_name,
+            event_name,
+            event_time,
+            http_client,
+            logger,
+        )
 
     async def send_recovery(
         self,
@@ -84,56 +125,394 @@ class WebhookNotifier:
         event_time: datetime,
         http_client: httpx.AsyncClient,
         logger: logging.Logger,
-    ) -> None:
-        if not self.config.url:
-            logger.warning(
-                "webhook notifier missing URL; skipping",
+    ) -> List[DeliveryOutcome]:
+        return await self._send(
+            "RESOLVED",
+            module_id,
+            result,
+            interval_seconds,
+            level_name,
+            event_name,
+            event_time,
+            http_client,
+            logger,
+        )
+
+    async def _send(
+        self,
+        status: str,
+        module_id: str,
+        result: MonitorResult,
+        interval_seconds: int,
+        level_name: str,
+        event_name: str,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> List[DeliveryOutcome]:
+        if not self._ready(module_id, logger):
+            return []
+        payload = _event_body(
+            status,
+            module_id,
+            result,
+            interval_seconds,
+            level_name,
+            event_name,
+            event_time,
+        )
+        return await self._post_all(
+            [
+                (target, payload)
+                for target in self.targets
+                if target.accepts(module_id, status)
+            ],
+            module_id,
+            http_client,
+            logger,
+        )
+
+    async def send_digest(
+        self,
+        scope: str,
+        alerts: List[DigestEntry],
+        recoveries: List[DigestEntry],
+        window_seconds: float,
+        event_time: datetime,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> List[DeliveryOutcome]:
+        if not self._ready(scope, logger):
+            return []
+        # Each target only sees the digest entries its filters accept.
+        posts = []
+        for target in self.targets:
+            target_alerts = [
+                _digest_body("ALERT", entry)
+                for entry in alerts
+                if target.accepts(entry.module_id, "ALERT")
+            ]
+            target_recoveries = [
+                _digest_body("RESOLVED", entry)
+                for entry in recoveries
+                if target.accepts(entry.module_id, "RESOLVED")
+            ]
+            if not target_alerts and not target_recoveries:
+                continue
+            payload = {
+                "timestamp": event_time.isoformat(),
+                "event": "notification_digest",
+                "scope": scope,
+                "status": "DIGEST",
+                "window_seconds": window_seconds,
+                "alerts": target_alerts,
+                "recoveries": target_recoveries,
+            }
+            posts.append((target, payload))
+        return await self._post_all(posts, scope, http_client, logger)
+
+    def _ready(self, module_id: str, logger: logging.Logger) -> bool:
+        if self.targets:
+            return True
+        logger.warning(
+            "webhook notifier missing URL; skipping",
+            extra={
+                "event": "notify_skip",
+                "module_id": module_id,
+                "target": "webhook",
+            },
+        )
+        return False
+
+    async def _post_all(
+        self,
+        posts: List[Tuple[WebhookTarget, dict]],
+        module_id: str,
+        http_client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> List[DeliveryOutcome]:
+        client = self._client or http_client
+        return list(
+            await asyncio.gather(
+                *(
+                    self._post(target, module_id, payload, client, logger)
+                    for target, payload in posts
+                )
+            )
+        )
+
+    async def _post(
+        self,
+        target: WebhookTarget,
+        module_id: str,
+        payload: dict,
+        client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> DeliveryOutcome:
+        if self.config.batch_seconds > 0:
+            return await self._add_to_batch(target, module_id, payload, client, logger)
+
+        entry = await self.outbox.add(
+            target.name, module_id, _dumps(payload), _JSON, lease_seconds=_LEASE_SECONDS
+        )
+        return await self._attempt(target, entry, client, logger)
+
+    async def _add_to_batch(
+        self,
+        target: WebhookTarget,
+        module_id: str,
+        payload: dict,
+        client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> DeliveryOutcome:
+        # Events are written to the outbox right away, leased long enough to
+        # be folded into one NDJSON delivery after at most `batch_seconds`
+        # (or `batch_max_events`). If the process dies first, the retry loop
+        # sends them one by one once the lease runs out.
+        entry = await self.outbox.add(
+            target.name,
+            module_id,
+            _dumps(payload),
+            _JSON,
+            lease_seconds=self.config.batch_seconds + _LEASE_SECONDS,
+        )
+        batch = self._batches.get(target.name)
+        if batch is None:
+            batch = PendingBatch(target=target, client=client, logger=logger)
+            batch.timer = self._spawn(self._flush_batch_later(batch))
+            self._batches[target.name] = batch
+        batch.keys.append(entry.key)
+        if module_id not in batch.module_ids:
+            batch.module_ids.append(module_id)
+        if len(batch.keys) >= self.config.batch_max_events:
+            del self._batches[target.name]
+            batch.timer.cancel()
+            self._spawn(self._send_batch(batch))
+        return DeliveryOutcome(target.label, False, "batched", queued=True)
+
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+        return task
+
+    async def _flush_batch_later(self, batch: "PendingBatch") -> None:
+        await asyncio.sleep(self.config.batch_seconds)
+        if self._batches.get(batch.target.name) is batch:
+            del self._batches[batch.target.name]
+            await self._send_batch(batch)
+
+    async def _send_batch(self, batch: "PendingBatch") -> None:
+        entry = await self.outbox.combine(
+            batch.keys,
+            batch.target.name,
+            ",".join(batch.module_ids),
+            _NDJSON,
+            lease_seconds=_LEASE_SECONDS,
+        )
+        if entry is not None:
+            await self._attempt(batch.target, entry, batch.client, batch.logger)
+
+    async def _retry_loop(self, logger: logging.Logger) -> None:
+        # Runs beside fresh deliveries, which never wait for it.
+        replayed = await self.outbox.release_all()
+        if replayed:
+            logger.info(
+                "replaying webhook outbox",
                 extra={
-                    "event": "notify_skip",
-                    "module_id": module_id,
+                    "event": "notify_replay",
                     "target": "webhook",
+                    "reason": f"{replayed} pending deliveries",
+                },
+            )
+        while True:
+            entries = []
+            try:
+                entries = await self.outbox.due(_RETRY_BATCH)
+                if entries:
+                    await asyncio.gather(
+                        *(self._retry(entry, logger) for entry in entries)
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.error(
+                    "webhook outbox retry failed",
+                    extra={"event": "notify_error", "target": "webhook", "reason": str(exc)},
+                )
+            if len(entries) < _RETRY_BATCH:
+                await asyncio.sleep(_RETRY_POLL_SECONDS)
+
+    async def _retry(self, entry: OutboxEntry, logger: logging.Logger) -> None:
+        target = self._targets_by_name.get(entry.target)
+        if target is None:
+            await self.outbox.ack(entry.key)
+            logger.error(
+                "webhook target no longer configured; dropping delivery",
+                extra={
+                    "event": "notify_drop",
+                    "module_id": entry.module_id,
+                    "target": f"webhook:{entry.target}",
                 },
             )
             return
+        await self._attempt(target, entry, self._client, logger)
 
-        headers = {}
-        if self.config.token:
-            headers[self.config.header_name] = self.config.token
-
-        payload = {
-            "timestamp": event_time.isoformat(),
-            "level": level_name,
-            "event": event_name,
-            "module": module_id,
-            "status": "RESOLVED",
-            "message": result.message,
-            "reason": result.reason,
-            "payload": result.payload,
-            "interval_seconds": interval_seconds,
+    async def _attempt(
+        self,
+        target: WebhookTarget,
+        entry: OutboxEntry,
+        client: httpx.AsyncClient,
+        logger: logging.Logger,
+    ) -> DeliveryOutcome:
+        headers = {
+            **target.headers,
+            "Content-Type": entry.content_type,
+            "Idempotency-Key": entry.key,
         }
+        content = entry.body.encode("utf-8")
+        if self.config.gzip_min_bytes and len(content) >= self.config.gzip_min_bytes:
+            content = gzip.compress(content)
+            headers["Content-Encoding"] = "gzip"
 
+        start = time.perf_counter()
+        retry_after = None
         try:
-            await http_client.post(
-                self.config.url,
-                json=payload,
+            response = await client.post(
+                target.url,
+                content=content,
                 headers=headers,
                 timeout=10.0,
             )
-            logger.info(
-                "webhook notification sent",
-                extra={
-                    "event": "notify",
-                    "module_id": module_id,
-                    "target": "webhook",
-                },
-            )
         except Exception as exc:  # noqa: BLE001
+            error = str(exc) or type(exc).__name__
+        else:
+            if response.status_code < 400:
+                await self.outbox.ack(entry.key)
+                logger.info(
+                    "webhook notification sent",
+                    extra={
+                        "event": "notify",
+                        "module_id": entry.module_id,
+                        "target": target.label,
+                    },
+                )
+                return DeliveryOutcome(target.label, True, None, _elapsed_ms(start))
+            error = f"status {response.status_code}"
+            if not _is_retryable(response.status_code):
+                await self.outbox.ack(entry.key)
+                logger.error(
+                    "webhook notification rejected",
+                    extra={
+                        "event": "notify_error",
+                        "module_id": entry.module_id,
+                        "target": target.label,
+                        "reason": error,
+                    },
+                )
+                return DeliveryOutcome(target.label, False, error, _elapsed_ms(start))
+            retry_after = _retry_after(response)
+
+        attempts = entry.attempts + 1
+        if self.config.max_attempts and attempts >= self.config.max_attempts:
+            await self.outbox.ack(entry.key)
             logger.error(
-                "webhook notification failed",
+                "webhook notification abandoned",
                 extra={
-                    "event": "notify_error",
-                    "module_id": module_id,
-                    "target": "webhook",
-                    "reason": str(exc),
+                    "event": "notify_drop",
+                    "module_id": entry.module_id,
+                    "target": target.label,
+                    "reason": f"{error} after {attempts} attempts",
                 },
             )
+            return DeliveryOutcome(target.label, False, error, _elapsed_ms(start))
+
+        delay = _backoff(
+            attempts, self.config.retry_base_seconds, self.config.retry_max_seconds
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        await self.outbox.reschedule(entry.key, attempts, delay, error)
+        logger.warning(
+            "webhook notification failed; retrying",
+            extra={
+                "event": "notify_retry",
+                "module_id": entry.module_id,
+                "target": target.label,
+                "reason": f"{error}; attempt {attempts}, next in {delay:.1f}s",
+            },
+        )
+        return DeliveryOutcome(
+            target.label, False, f"{error}; queued for retry", _elapsed_ms(start)
+        )
+
+
+@dataclass
+class PendingBatch:
+    target: WebhookTarget
+    client: httpx.AsyncClient
+    logger: logging.Logger
+    keys: List[str] = field(default_factory=list)
+    module_ids: List[str] = field(default_factory=list)
+    timer: Optional[asyncio.Task] = None
+
+
+def _dumps(payload: dict) -> str:
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _is_retryable(status_code: int) -> bool:
+    # Other 4xx answers mean the request itself is wrong; resending won't help.
+    return status_code in (408, 425, 429) or status_code >= 500
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return None
+
+
+def _backoff(attempts: int, base: float, ceiling: float) -> float:
+    # Exponential with jitter so a receiver coming back is not hit by every
+    # pending delivery at once.
+    delay = min(base * 2 ** (attempts - 1), ceiling)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _event_body(
+    status: str,
+    module_id: str,
+    result: MonitorResult,
+    interval_seconds: int,
+    level_name: str,
+    event_name: str,
+    event_time: datetime,
+) -> dict:
+    return {
+        "timestamp": event_time.isoformat(),
+        "level": level_name,
+        "event": event_name,
+        "module": module_id,
+        "status": status,
+        "message": result.message,
+        "reason": result.reason,
+        "payload": result.payload,
+        "interval_seconds": interval_seconds,
+    }
+
+
+def _digest_body(status: str, entry: DigestEntry) -> dict:
+    return _event_body(
+        status,
+        entry.module_id,
+        entry.result,
+        entry.interval_seconds,
+        entry.level_name,
+        entry.event_name,
+        entry.event_time,
+    )
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
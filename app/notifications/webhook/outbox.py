@@ -0,0 +1,199 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_ADDED_COLUMNS = {
+    "content_type": "TEXT NOT NULL DEFAULT 'application/json'",
+    "target": "TEXT NOT NULL DEFAULT 'default'",
+}
+
+
+@dataclass
+class OutboxEntry:
+    key: str
+    target: str
+    module_id: str
+    body: str
+    content_type: str = "application/json"
+    attempts: int = 0
+
+
+class WebhookOutbox:
+    """SQLite table of webhook deliveries not yet acknowledged by the receiver.
+
+    A delivery is written before its first attempt and deleted once the
+    receiver accepts it, so a crash or restart in between replays it
+    (at-least-once; the entry key doubles as the idempotency key). An empty
+    `path` keeps the table in memory: retries still apply but do not
+    survive a restart. Statements run in a worker thread so disk syncs
+    never stall the event loop.
+    """
+
+    def __init__(self, path: str = "") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path or ":memory:", check_same_thread=False, isolation_level=None
+        )
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " key TEXT PRIMARY KEY,"
+            " target TEXT NOT NULL DEFAULT 'default',"
+            " module_id TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " content_type TEXT NOT NULL DEFAULT 'application/json',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " last_error TEXT)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_next_attempt ON outbox (next_attempt_at)"
+        )
+        # Outboxes written by earlier versions lack the newer columns.
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        for column, definition in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE outbox ADD COLUMN {column} {definition}")
+
+    async def add(
+        self,
+        target: str,
+        module_id: str,
+        body: str,
+        content_type: str,
+        lease_seconds: float,
+    ) -> OutboxEntry:
+        """Persist a new delivery; the retry loop leaves it alone for
+        `lease_seconds` while the caller makes the first attempt."""
+        entry = OutboxEntry(
+            key=uuid.uuid4().hex,
+            target=target,
+            module_id=module_id,
+            body=body,
+            content_type=content_type,
+        )
+        await self._run(
+            lambda db: db.execute(
+                "INSERT INTO outbox"
+                " (key, target, module_id, body, content_type, next_attempt_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    entry.key,
+                    entry.target,
+                    entry.module_id,
+                    entry.body,
+                    entry.content_type,
+                    time.time() + lease_seconds,
+                ),
+            )
+        )
+        return entry
+
+    async def combine(
+        self,
+        keys: List[str],
+        target: str,
+        module_id: str,
+        content_type: str,
+        lease_seconds: float,
+    ) -> Optional[OutboxEntry]:
+        """Replace the rows in `keys` by one delivery whose body is theirs
+        joined as NDJSON lines, in a single transaction. Rows already gone
+        (sent on their own after a lease expired) are skipped; returns None
+        when none are left."""
+        key = uuid.uuid4().hex
+        placeholders = ",".join("?" * len(keys))
+
+        def statement(db: sqlite3.Connection) -> Optional[OutboxEntry]:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                found = dict(
+                    db.execute(
+                        f"SELECT key, body FROM outbox WHERE key IN ({placeholders})", keys
+                    ).fetchall()
+                )
+                entry = None
+                if found:
+                    entry = OutboxEntry(
+                        key=key,
+                        target=target,
+                        module_id=module_id,
+                        body="".join(found[k] + "\n" for k in keys if k in found),
+                        content_type=content_type,
+                    )
+                    db.execute(
+                        "INSERT INTO outbox"
+                        " (key, target, module_id, body, content_type, next_attempt_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            entry.key,
+                            entry.target,
+                            entry.module_id,
+                            entry.body,
+                            entry.content_type,
+                            time.time() + lease_seconds,
+                        ),
+                    )
+                    db.execute(f"DELETE FROM outbox WHERE key IN ({placeholders})", keys)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            return entry
+
+        return await self._run(statement)
+
+    async def due(self, limit: int) -> List[OutboxEntry]:
+        rows = await self._run(
+            lambda db: db.execute(
+                "SELECT key, target, module_id, body, content_type, attempts FROM outbox"
+                " WHERE next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        )
+        return [OutboxEntry(*row) for row in rows]
+
+    async def ack(self, key: str) -> None:
+        await self._run(lambda db: db.execute("DELETE FROM outbox WHERE key = ?", (key,)))
+
+    async def reschedule(self, key: str, attempts: int, delay: float, error: str) -> None:
+        await self._run(
+            lambda db: db.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?"
+                " WHERE key = ?",
+                (attempts, time.time() + delay, error, key),
+            )
+        )
+
+    async def release_all(self) -> int:
+        """Make every stored delivery due now; used to replay on startup."""
+        return await self._run(
+            lambda db: db.execute(
+                "UPDATE outbox SET next_attempt_at = ?", (time.time(),)
+            ).rowcount
+        )
+
+    async def pending(self) -> int:
+        return await self._run(
+            lambda db: db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    async def _run(self, statement: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.to_thread(self._locked, statement)
+
+    def _locked(self, statement: Callable[[sqlite3.Connection], T]) -> T:
+        with self._lock:
+            return statement(self._db)
@@ -0,0 +1,76 @@
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.steam.monitor import _parse_services  # noqa: E402
+
+# Regex extractor used by the steam module before the single-pass tag scanner.
+_LEGACY_SERVICE_PATTERN = (
+    r'<div class="(?:sep )?service">.*?<span class="name">(.*?)</span>.*?'
+    r'<span class="status ([^"]+)" id="([^"]+)">(.*?)</span>'
+)
+
+
+def _parse_services_regex(body: str):
+    service_pattern = re.compile(_LEGACY_SERVICE_PATTERN, re.IGNORECASE | re.DOTALL)
+    tag_pattern = re.compile(r"<[^>]+>")
+    for match in service_pattern.finditer(body):
+        status_id = match.group(3).strip().lower()
+        if status_id == "pageviews":
+            continue
+        name = tag_pattern.sub("", match.group(1)).strip() or "unknown-service"
+        yield {"id": status_id, "name": name, "class": match.group(2)}
+
+
+def _synthetic_page(services: int) -> str:
+    blocks = [
+        f'<div class="service"><span class="name"><a href="/s{i}">Service {i}</a></span>'
+        f'<span class="status good" id="svc{i}">Normal</span></div>'
+        for i in range(services)
+    ]
+    return "<html><body>" + "<p>filler</p>" * 2000 + "".join(blocks) + "</body></html>"
+
+
+def _drifted_page(services: int) -> str:
+    # Status spans renamed: every lazy `.*?` in the legacy pattern runs to the
+    # end of the page before failing.
+    blocks = [
+        f'<div class="service"><span class="name">Service {i}</span>'
+        f'<span class="state good" id="svc{i}">Normal</span></div>'
+        for i in range(services)
+    ]
+    return "<html><body>" + "".join(blocks) + "</body></html>"
+
+
+def main() -> int:
+    pages = {}
+    for raw_path in sys.argv[1:]:
+        path = Path(raw_path)
+        if not path.exists():
+            print(f"{path} not found")
+            return 1
+        pages[path.name] = path.read_text(encoding="utf-8", errors="replace")
+    if not pages:
+        print("no recorded pages given; using a synthetic page")
+        pages["synthetic"] = _synthetic_page(200)
+        pages["synthetic-drifted"] = _drifted_page(30)
+
+    for name, body in pages.items():
+        legacy = [svc["id"] for svc in _parse_services_regex(body)]
+        current = [svc["id"] for svc in _parse_services(body)]
+        runs = 5
+        legacy_ms = timeit.timeit(lambda: list(_parse_services_regex(body)), number=runs) / runs * 1000
+        current_ms = timeit.timeit(lambda: list(_parse_services(body)), number=runs) / runs * 1000
+        print(
+            f"{name}: {len(body)} chars, services regex={len(legacy)} parser={len(current)}, "
+            f"same_ids={legacy == current}, regex={legacy_ms:.2f}ms parser={current_ms:.2f}ms"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Iterable, List
+
+import pytest
+
+from app.core.config import (
+    AlertStateConfig,
+    ModuleConfig,
+    NotificationConfig,
+    NotificationQueueConfig,
+    RuleConfig,
+    TelegramConfig,
+    WebhookConfig,
+)
+from app.core.types import DeliveryOutcome, MonitorResult
+
+
+class RecordingNotifier:
+    """Stands in for a notification backend and records what it was asked to send."""
+
+    def __init__(self, delays: Iterable[float] = ()) -> None:
+        # Seconds each successive send takes; later sends are immediate.
+        self.delays = list(delays)
+        self.sent: List[tuple[str, MonitorResult]] = []
+
+    async def send_alert(self, **kwargs) -> List[DeliveryOutcome]:
+        return await self._record("alert", kwargs["result"])
+
+    async def send_recovery(self, **kwargs) -> List[DeliveryOutcome]:
+        return await self._record("recovery", kwargs["result"])
+
+    async def _record(self, kind: str, result: MonitorResult) -> List[DeliveryOutcome]:
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        self.sent.append((kind, result))
+        return [DeliveryOutcome("recording", True)]
+
+
+@pytest.fixture
+def recording_notifier():
+    return RecordingNotifier
+
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    return logging.getLogger("tests")
+
+
+@pytest.fixture
+def notification_config():
+    def build(
+        workers: int = 1,
+        merge: bool = True,
+        state_path: str = "",
+        max_size: int = 100,
+    ) -> NotificationConfig:
+        return NotificationConfig(
+            telegram=TelegramConfig(
+                enabled=False,
+                bot_token=None,
+                chat_ids=[],
+                api_url="https://telegram.invalid",
+                timestamp_format="%Y-%m-%d %H:%M:%S %Z",
+                timestamp_zone="UTC",
+            ),
+            webhook=WebhookConfig(enabled=False, targets=[]),
+            repeat_minutes=10,
+            queue=NotificationQueueConfig(
+                max_size=max_size, workers=workers, policy="block", merge=merge
+            ),
+            state=AlertStateConfig(
+                backend="file" if state_path else "memory",
+                path=state_path,
+                report_seconds=0.0,
+            ),
+        )
+
+    return build
+
+
+@pytest.fixture
+def module_config():
+    def build(slug: str, url: str, **overrides) -> ModuleConfig:
+        values = dict(
+            slug=slug,
+            url=url,
+            interval_seconds=60,
+            timeout_seconds=5.0,
+            user_agent="tests",
+            rule=RuleConfig(kind="status", value=""),
+            service_filter=[],
+            enabled=True,
+            urls=[url],
+            module_type=slug,
+        )
+        values.update(overrides)
+        return ModuleConfig(**values)
+
+    return build
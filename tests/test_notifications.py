@@ -0,0 +1,190 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from app.core import notifications
+from app.core.notifications import NotificationManager
+from app.core.types import MonitorResult, MonitorStatus
+from app.modules.gcp.monitor import GcpStatusMonitor
+
+GCP_URL = "https://status.example.test/incidents.json"
+
+
+def _incident(incident_id: str, ended: bool = False) -> dict:
+    return {
+        "id": incident_id,
+        "status_impact": "SERVICE_OUTAGE",
+        "modified": "2024-01-01T00:00:00Z" if not ended else "2024-01-01T01:00:00Z",
+        "end": "2024-01-01T01:00:00Z" if ended else None,
+        "currently_affected_locations": [{"id": "us-east1", "title": "South Carolina"}],
+        "most_recent_update": {"status": "SERVICE_OUTAGE"},
+    }
+
+
+def test_resolved_gcp_incident_sends_recovery_for_that_incident(
+    notification_config, module_config, recording_notifier, logger
+):
+    feeds = [
+        [_incident("inc-1"), _incident("inc-2")],
+        [_incident("inc-1", ended=True), _incident("inc-2")],
+        [_incident("inc-1", ended=True), _incident("inc-2", ended=True)],
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps(feeds.pop(0)).encode())
+
+    async def scenario() -> list:
+        config = module_config("gcp", GCP_URL)
+        monitor = GcpStatusMonitor()
+        monitor.configure(config)
+        manager = NotificationManager(notification_config())
+        recorder = recording_notifier()
+        manager.telegram_notifier = recorder
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for _ in range(3):
+                result = await monitor.check(client, logger)
+                await manager.handle_result(
+                    module_id="gcp",
+                    result=result,
+                    module_config=config,
+                    level_name="INFO",
+                    event_name="monitor_check",
+                    event_time=datetime.now(timezone.utc),
+                    http_client=client,
+                    logger=logger,
+                )
+        return recorder.sent
+
+    sent = asyncio.run(scenario())
+
+    assert [(kind, result.payload[0]["id"]) for kind, result in sent] == [
+        ("alert", "inc-1"),
+        ("alert", "inc-2"),
+        ("recovery", "inc-1"),
+        ("recovery", "inc-2"),
+    ]
+    assert sent[2][1].status.value == "OK"
+    assert "inc-1" in sent[2][1].reason
+
+
+def test_gcp_incident_ended_during_restart_is_recovered(
+    notification_config, module_config, recording_notifier, logger, tmp_path
+):
+    feeds = [
+        [_incident("inc-1"), _incident("inc-2")],
+        [_incident("inc-1", ended=True), _incident("inc-2")],
+    ]
+    state_path = str(tmp_path / "alert-state.json")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps(feeds.pop(0)).encode())
+
+    async def run_process(client: httpx.AsyncClient) -> list:
+        # A fresh monitor and manager per run, as after a pod restart.
+        config = module_config("gcp", GCP_URL)
+        monitor = GcpStatusMonitor()
+        monitor.configure(config)
+        manager = NotificationManager(notification_config(state_path=state_path))
+        recorder = recording_notifier()
+        manager.telegram_notifier = recorder
+        await manager.start(client, logger)
+        result = await monitor.check(client, logger)
+        await manager.handle_result(
+            module_id="gcp",
+            result=result,
+            module_config=config,
+            level_name="INFO",
+            event_name="monitor_check",
+            event_time=datetime.now(timezone.utc),
+            http_client=client,
+            logger=logger,
+        )
+        await manager.stop()
+        return recorder.sent
+
+    async def scenario() -> tuple:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await run_process(client), await run_process(client)
+
+    before, after = asyncio.run(scenario())
+
+    assert [(kind, result.payload[0]["id"]) for kind, result in before] == [
+        ("alert", "inc-1"),
+        ("alert", "inc-2"),
+    ]
+    assert [(kind, result.payload[0]["id"]) for kind, result in after] == [
+        ("recovery", "inc-1"),
+    ]
+
+
+def test_service_notifications_keep_order_across_workers(
+    notification_config, module_config, recording_notifier, logger
+):
+    item = {"id": "api", "name": "API", "status": "major_outage"}
+    flaps = [MonitorStatus.ALERT, MonitorStatus.OK, MonitorStatus.ALERT]
+
+    async def scenario() -> list:
+        config = module_config("vendor", "https://status.vendor.test")
+        manager = NotificationManager(notification_config(workers=2))
+        # The first alert is slow, as if held by a Telegram 429 retry.
+        recorder = recording_notifier(delays=[0.05])
+        manager.telegram_notifier = recorder
+        async with httpx.AsyncClient() as client:
+            await manager.start(client, logger)
+            for status in flaps:
+                await manager.handle_result(
+                    module_id="vendor",
+                    result=MonitorResult(status=status, message="", payload=[item]),
+                    module_config=config,
+                    level_name="INFO",
+                    event_name="monitor_check",
+                    event_time=datetime.now(timezone.utc),
+                    http_client=client,
+                    logger=logger,
+                )
+            await manager.stop()
+        return recorder.sent
+
+    sent = asyncio.run(scenario())
+
+    assert [kind for kind, _ in sent] == ["alert", "recovery", "alert"]
+
+
+def test_full_queue_does_not_stall_the_check(
+    notification_config, module_config, recording_notifier, logger, monkeypatch
+):
+    monkeypatch.setattr(notifications, "_BLOCK_TIMEOUT_SECONDS", 0.05)
+    config = module_config("vendor", "https://status.vendor.test")
+
+    async def scenario() -> tuple:
+        manager = NotificationManager(notification_config(max_size=1))
+        # Delivery is stuck, as if Telegram were holding every send.
+        manager.telegram_notifier = recording_notifier(delays=[1.0, 1.0, 1.0])
+        async with httpx.AsyncClient() as client:
+            await manager.start(client, logger)
+            started = time.perf_counter()
+            for service in ["api", "web", "db"]:
+                item = {"id": service, "name": service, "status": "major_outage"}
+                await manager.handle_result(
+                    module_id="vendor",
+                    result=MonitorResult(
+                        status=MonitorStatus.ALERT, message="", payload=[item]
+                    ),
+                    module_config=config,
+                    level_name="WARNING",
+                    event_name="monitor_check",
+                    event_time=datetime.now(timezone.utc),
+                    http_client=client,
+                    logger=logger,
+                )
+            elapsed = time.perf_counter() - started
+            await manager.stop(timeout=0)
+        return elapsed, manager.dropped
+
+    elapsed, dropped = asyncio.run(scenario())
+
+    assert elapsed < 0.5
+    assert dropped == 1
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from app.core.fetch import RequestLimiter
+from app.core.scheduler import _prewarm, _run_check
+from app.modules.gcp.monitor import GcpStatusMonitor
+from app.modules.steam.monitor import SteamMonitor
+
+
+def test_prewarm_targets_the_steam_feed_in_json_mode(module_config, logger):
+    monitor = SteamMonitor()
+    config = module_config(
+        "steam",
+        "https://store.steampowered.test/stats",
+        parse_mode="json",
+        feed_url="https://feed.steamstat.test/status.json",
+    )
+    monitor.configure(config)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, str(request.url)))
+        return httpx.Response(200)
+
+    async def scenario() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await _prewarm(monitor, config, client, logger, RequestLimiter())
+
+    asyncio.run(scenario())
+
+    assert seen == [("HEAD", "https://feed.steamstat.test/status.json")]
+
+
+def test_prewarm_skips_hosts_with_an_idle_connection(module_config, logger):
+    requests = []
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                requests.append(head.split(b" ", 1)[0])
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def scenario() -> None:
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        config = module_config("gcp", f"http://127.0.0.1:{port}/incidents.json")
+        async with server, httpx.AsyncClient() as client:
+            await _prewarm(object(), config, client, logger, RequestLimiter())
+            await _prewarm(object(), config, client, logger, RequestLimiter())
+
+    asyncio.run(scenario())
+
+    assert requests == [b"HEAD"]
+
+
+def test_host_queueing_does_not_hold_global_slots(module_config, logger, caplog):
+    caplog.set_level(logging.INFO, logger="tests")
+    finished = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, content=b"[]")
+
+    async def scenario() -> None:
+        limiter = RequestLimiter(max_concurrency=4, max_per_host=1)
+        started = time.perf_counter()
+
+        async def run(slug: str, host: str) -> None:
+            monitor = GcpStatusMonitor(slug)
+            config = module_config(slug, f"https://{host}/incidents.json")
+            monitor.configure(config)
+            await _run_check(monitor, config, client, logger, None, limiter, 0.0)
+            finished[slug] = time.perf_counter() - started
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await asyncio.gather(
+                *(run(f"a{index}", "a.test") for index in range(4)), run("b", "b.test")
+            )
+
+    asyncio.run(scenario())
+
+    assert finished["b"] < 0.35
+    checks = {
+        record.module_id: record
+        for record in caplog.records
+        if getattr(record, "event", None) == "monitor_check"
+    }
+    last = checks["a3"]
+    assert last.queue_ms >= 500
+    assert last.duration_ms < 350
@@ -0,0 +1,61 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+
+from app.core.notifications import NotificationManager
+from app.modules.statuspage.monitor import StatuspageMonitor
+
+PAGES = ["https://status.one.test", "https://status.two.test"]
+
+
+def _summary(status: str) -> bytes:
+    return json.dumps(
+        {"components": [{"id": "api", "name": "API", "status": status}]}
+    ).encode()
+
+
+def test_recovered_page_resolves_while_another_page_is_alerting(
+    notification_config, module_config, recording_notifier, logger
+):
+    polls = [
+        {"status.one.test": "major_outage", "status.two.test": "major_outage"},
+        {"status.one.test": "major_outage", "status.two.test": "operational"},
+    ]
+    current = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=_summary(current[request.url.host]))
+
+    async def scenario() -> list:
+        config = module_config("vendors", PAGES[0], urls=PAGES, module_type="statuspage")
+        monitor = StatuspageMonitor(slug="vendors")
+        monitor.configure(config)
+        manager = NotificationManager(notification_config())
+        recorder = recording_notifier()
+        manager.telegram_notifier = recorder
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for statuses in polls:
+                current.update(statuses)
+                result = await monitor.check(client, logger)
+                assert result.status.value == "ALERT"
+                await manager.handle_result(
+                    module_id="vendors",
+                    result=result,
+                    module_config=config,
+                    level_name="WARNING",
+                    event_name="monitor_check",
+                    event_time=datetime.now(timezone.utc),
+                    http_client=client,
+                    logger=logger,
+                )
+        return recorder.sent
+
+    sent = asyncio.run(scenario())
+
+    assert [(kind, result.payload[0]["id"]) for kind, result in sent] == [
+        ("alert", "status.one.test:api"),
+        ("alert", "status.two.test:api"),
+        ("recovery", "status.two.test:api"),
+    ]
@@ -0,0 +1,23 @@
+from app.modules.steam.monitor import _parse_services
+
+DOUBLE_QUOTED = (
+    '<div class="service"><span class="name"><a href="#">Steam Store</a></span>'
+    '<span class="status major" id="store">Offline</span></div>'
+)
+
+
+def test_single_quoted_markup_parses_like_double_quoted():
+    single_quoted = DOUBLE_QUOTED.replace('"', "'")
+
+    services = list(_parse_services(single_quoted))
+
+    assert services == list(_parse_services(DOUBLE_QUOTED))
+    assert services == [
+        {
+            "name": "Steam Store",
+            "class": "major",
+            "id": "store",
+            "severity": "major",
+            "status_text": "Offline",
+        }
+    ]
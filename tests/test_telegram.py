@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from app.core.config import TelegramConfig
+from app.core.types import DigestEntry, MonitorResult, MonitorStatus
+from app.notifications.telegram.notifier import TelegramNotifier
+
+
+def _config(**overrides) -> TelegramConfig:
+    values = dict(
+        enabled=True,
+        bot_token="token",
+        chat_ids=["1001"],
+        api_url="https://telegram.invalid",
+        timestamp_format="%Y-%m-%d %H:%M:%S %Z",
+        timestamp_zone="UTC",
+    )
+    values.update(overrides)
+    return TelegramConfig(**values)
+
+
+def test_429_retry_after_is_honored_without_a_chat_rate(logger):
+    config = _config(rate_global_per_second=0.0, rate_chat_per_second=0.0)
+    sent_at = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent_at.append(time.monotonic())
+        if len(sent_at) == 1:
+            body = {"ok": False, "parameters": {"retry_after": 0.3}}
+            return httpx.Response(429, content=json.dumps(body).encode())
+        return httpx.Response(200, content=b'{"ok": true}')
+
+    async def scenario() -> list:
+        notifier = TelegramNotifier(config)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await notifier.send_alert(
+                module_id="steam",
+                result=MonitorResult(status=MonitorStatus.ALERT, message="degraded"),
+                interval_seconds=60,
+                level_name="WARNING",
+                event_name="monitor_check",
+                event_time=datetime.now(timezone.utc),
+                http_client=client,
+                logger=logger,
+            )
+
+    outcomes = asyncio.run(scenario())
+
+    assert [outcome.ok for outcome in outcomes] == [True]
+    assert len(sent_at) == 2
+    assert sent_at[1] - sent_at[0] >= 0.3
+
+
+def test_full_digest_fits_in_one_telegram_message(logger):
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content)["text"])
+        return httpx.Response(200, content=b'{"ok": true}')
+
+    def entries(status: MonitorStatus, count: int) -> list:
+        regions = ", ".join(f"region-{index}" for index in range(6))
+        return [
+            DigestEntry(
+                module_id=f"statuspage-{index}",
+                result=MonitorResult(
+                    status=status, message="", reason=f"{regions}: major_outage"
+                ),
+                interval_seconds=60,
+                level_name="WARNING",
+                event_name="service_alert",
+                event_time=datetime.now(timezone.utc),
+            )
+            for index in range(count)
+        ]
+
+    async def scenario() -> list:
+        notifier = TelegramNotifier(_config())
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await notifier.send_digest(
+                scope="global",
+                alerts=entries(MonitorStatus.ALERT, 60),
+                recoveries=entries(MonitorStatus.OK, 60),
+                window_seconds=30,
+                event_time=datetime.now(timezone.utc),
+                http_client=client,
+                logger=logger,
+            )
+
+    outcomes = asyncio.run(scenario())
+
+    assert [outcome.ok for outcome in outcomes] == [True]
+    assert len(sent[0]) <= 4096
+    assert "statuspage-0" in sent[0]
+    assert "more" in sent[0]